@@ -1,8 +1,43 @@
+import math
+import os
+import random
+import sys
+import time
 from Range import *
 from collections import OrderedDict
-import random
 from mathutils import Vector
 
+# Adicionar o diretório scripts ao path se necessário
+script_dir = os.path.dirname(__file__)
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from maze import MazeGrid, MazeRandom, MazeGraph, HierarchicalPathfinder, FlowFieldService, level_size, level_seed, GENERATOR_STEPS, DistanceField
+from maze.prefetch import LevelPrefetcher, LevelData, open_cache, level_cache_key, load_cached_level
+from maze.pack import open_level_pack
+from maze.snapshot import MazeSnapshot
+from maze.layout import LAYOUTS, DiameterLayout, place_ends, plan_layout
+from maze.endless import ChunkStreamer, generate_chunk, owned_walls, world_chunk, start_cell
+from maze.bands import EllerBandStream
+from maze.mesh import (
+    wall_boxes, MeshUpload, FACE_FRONT, FACE_BACK, FACE_RIGHT, FACE_LEFT, FACE_TOP, FACE_BOTTOM, FACE_ALL,
+)
+
+try:
+    from maze import mesh_arrays
+except ImportError:
+    mesh_arrays = None
+
+try:
+    from maze import analytics, difficulty as difficulty_search
+except ImportError:
+    analytics = difficulty_search = None
+
+# Vértices convertidos por etapa quando a malha é montada no thread principal
+UPLOAD_BLOCK = 4096
+# Índices por chamada de addIndex (múltiplo de 3)
+INDEX_BLOCK = 3 * 65536
+
 class MazeBuilder(types.KX_PythonComponent):
     args = OrderedDict([
         ("level", 1),
@@ -10,72 +45,227 @@ class MazeBuilder(types.KX_PythonComponent):
         ("wall_thickness", 0.2),
         ("wall_height", 1),
         ("wall_material", ""),
+        ("merge_walls", True),
+        ("cull_hidden_faces", True),
+        ("chunk_size", 16),
+        ("chunk_object", "MazeChunk"),
+        ("frame_budget_ms", 8.0),
+        ("prefetch", True),
+        ("prefetch_processes", False),
+        ("buffer_object", "MazeBuffer"),
+        ("seed", 1),
+        ("cache_dir", "//maze_cache"),
+        ("cache_max_mb", 256),
+        ("generator", "backtracker"),
+        ("endless", False),
+        ("endless_focus", "Player"),
+        ("endless_radius", 2),
+        ("endless_max_chunks", 0),
+        ("endless_max_mb", 64),
+        ("endless_width", 4),
+        ("level_pack", ""),
+        ("layout", "diameter"),
+        ("checkpoints", 0),
+        ("collectibles", 0),
+        ("difficulty", ""),
+        ("chase_target", "Player"),
     ])
     def awake(self, args):
-        self.grid = []
-        self.stack = []
-        self.current = None
+        self.maze = None
         self.generated = False
         self.mesh_builder = None
+        self.chunk_objects = {}
+        self.roots = []
+        self.chunk_sets = []
+        self.front = 0
+        self.target = 0
         self.exit_position = None
         self.start_position = None
+        self.build_job = None
+        self.build_progress = 1.0
+        self.on_ready = None
+        self.prefetcher = None
+        self.snapshot = None
+        self.cache = None
+        self.base_seed = 0
+        self.variant = 0
+        self.built_meshes = None
+        self.streamer = None
+        self.bands = None
+        self.endless_width = 4
+        self.stream_job = None
+        self.stream_center = None
+        self.free_chunks = []
+        self.level_pack = None
+        self.solver = None
+        # Fluxo PCG32 do labirinto atual: mesma semente = mesmo labirinto em qualquer máquina
+        self.rng = MazeRandom(0)
+        self.layout = "diameter"
+        self.level_layout = None
+        self.difficulty = ""
+        self.difficulty_target = None
+        self.level_metrics = None
+        self.graph = None
+        self.pathfinder = None
+        self.flow_field = None
+        self.chase_target = "Player"
 
     def start(self, args):
         self.scene = logic.getCurrentScene()
 
         self.level = max(1, int(args.get("nivel", 1)))
-        base = 6
-        self.rows = base + self.level * 2
-        self.cols = base + self.level * 2
+        self.rows, self.cols = level_size(self.level)
 
         self.cell_size = max(0.1, float(args["cell_size"]))
         self.wall_thickness = max(0.05, float(args["wall_thickness"]))
         self.wall_height = max(0.1, float(args["wall_height"]))
         self.wall_material = args.get("wall_material", "")
+        self.merge_walls = bool(args.get("merge_walls", True))
+        self.cull_hidden_faces = bool(args.get("cull_hidden_faces", True))
+        self.chunk_size = max(0, int(args.get("chunk_size", 16)))
+        self.chunk_object = args.get("chunk_object", "MazeChunk")
+        self.buffer_object = args.get("buffer_object", "MazeBuffer")
+        # Tempo máximo por frame para gerar/montar a malha (0 = tudo no mesmo frame)
+        self.frame_budget_ms = max(0.0, float(args.get("frame_budget_ms", 8.0)))
+        # Modo infinito: não há níveis, só chunks ao redor do jogador
+        self.endless = bool(args.get("endless", False))
+        # Gerar o próximo nível em segundo plano enquanto o atual é jogado
+        if args.get("prefetch", True) and not self.endless:
+            self.prefetcher = LevelPrefetcher(bool(args.get("prefetch_processes", False)))
+
+        # Algoritmo de geração: qualquer nome de GENERATOR_STEPS (backtracker, eller,
+        # kruskal, prim, wilson, growing_tree); compare com python -m maze.benchmark
+        self.generator = args.get("generator", "backtracker")
+        if self.generator not in GENERATOR_STEPS:
+            names = ", ".join(sorted(GENERATOR_STEPS))
+            print(f"[MazeBuilder] Gerador '{self.generator}' desconhecido ({names}), usando backtracker.")
+            self.generator = "backtracker"
+        # Entrada/saída: "diameter" (pontas do caminho mais longo) ou "random" (primeira/última linha)
+        self.layout = args.get("layout", "diameter")
+        if self.layout not in LAYOUTS:
+            print(f"[MazeBuilder] Layout '{self.layout}' desconhecido ({', '.join(LAYOUTS)}), usando diameter.")
+            self.layout = "diameter"
+        # Quantos checkpoints (no caminho) e coletáveis (em becos) planejar por nível
+        self.checkpoint_count = max(0, int(args.get("checkpoints", 0)))
+        self.collectible_count = max(0, int(args.get("collectibles", 0)))
+        # Faixas de dificuldade (ex.: "path_ratio=0.3:0.5,dead_ends=:40"): gera candidatos até cair nelas
+        difficulty = args.get("difficulty", "")
+        if difficulty and not difficulty_search:
+            print("[MazeBuilder] NumPy indisponível, args difficulty ignorado.")
+        elif difficulty:
+            try:
+                self.difficulty_target = difficulty_search.parse_target(difficulty)
+                self.difficulty = self.difficulty_target.spec()
+            except ValueError as e:
+                print(f"[MazeBuilder] Dificuldade '{difficulty}' inválida ({e}), ignorada.")
+        # Objeto seguido pelo campo de fluxo compartilhado dos inimigos (get_chase_position)
+        self.chase_target = args.get("chase_target", "Player")
+
+        # Semente base fixa = mesmos labirintos a cada execução (negativa = aleatória)
+        seed = int(args.get("seed", 1))
+        self.base_seed = seed if seed >= 0 else random.SystemRandom().getrandbits(32)
+        self.cache_max_bytes = max(0, int(args.get("cache_max_mb", 256))) * 1024 * 1024
+        self.cache_dir = args.get("cache_dir", "") if not self.endless else ""
+        if self.cache_dir:
+            self.cache_dir = logic.expandPath(self.cache_dir)
+            try:
+                self.cache = open_cache(self.cache_dir, self.cache_max_bytes)
+            except OSError as e:
+                print(f"[MazeBuilder] Cache desativado: {e}")
+                self.cache_dir = ""
+
+        # Pacote de níveis prontos (python -m maze.batch --pack): níveis presentes nele
+        # são lidos via mmap em O(1) em vez de gerados
+        pack_path = args.get("level_pack", "")
+        if pack_path and not self.endless:
+            self.level_pack = open_level_pack(logic.expandPath(pack_path))
+            if self.level_pack:
+                print(f"[MazeBuilder] Pacote de níveis: {len(self.level_pack)} níveis a partir do "
+                      f"{self.level_pack.first_level}")
 
+        if self.endless and self.create_endless(args):
+            return
+        self.create_buffers()
         self.create_grid()
-        self.current = self.grid[0]
         self.reGenerate()
 
+    def create_endless(self, args):
+        """
+        Modo infinito: gera, monta e dá física só aos chunks ao redor do
+        objeto endless_focus; os distantes são despejados (LRU) conforme o
+        orçamento de chunks/memória, então o custo não cresce com a distância
+        """
+        template = self.scene.objectsInactive.get(self.chunk_object, None) if self.chunk_object else None
+        if not template or not self.get_wall_material():
+            print(f"[MazeBuilder] Modo infinito precisa do objeto '{self.chunk_object}' e do material; desativado.")
+            self.endless = False
+            return False
+
+        self.chunk_template = template
+        self.chunk_size = self.chunk_size or 16
+        self.endless_focus = args.get("endless_focus", "Player")
+        self.streamer = ChunkStreamer(
+            int(args.get("endless_radius", 2)),
+            int(args.get("endless_max_chunks", 0)),
+            max(0, int(args.get("endless_max_mb", 64))) * 1024 * 1024)
+        # Com eller o mundo é uma faixa de endless_width chunks que cresce só para +y
+        self.endless_width = max(1, int(args.get("endless_width", 4)))
+
+        self.roots = [self.object]
+        self.chunk_sets = [self.chunk_objects]
+        self.object.setVisible(False, False)
+        self.object.suspendPhysics()
+
+        print(f"[MazeBuilder] Modo infinito - chunks de {self.chunk_size} x {self.chunk_size}, "
+              f"até {self.streamer.max_chunks} carregados"
+              + (f", faixa de {self.endless_width} chunks (eller)" if self.generator == "eller" else ""))
+        self.restart_endless()
+        return True
+
+    def create_buffers(self):
+        """
+        Buffer duplo: o próximo labirinto é montado em um objeto escondido e
+        trocado com o visível em um único frame (ver swap_buffers)
+        """
+        self.roots = [self.object]
+        self.chunk_sets = [self.chunk_objects]
+
+        template = self.scene.objectsInactive.get(self.buffer_object, None) if self.buffer_object else None
+        if template:
+            back = self.scene.addObject(template, self.object)
+            back.setVisible(False, True)
+            back.suspendPhysics()
+            self.roots.append(back)
+            self.chunk_sets.append({})
+        else:
+            print(f"[MazeBuilder] Objeto '{self.buffer_object}' não encontrado, sem buffer duplo.")
+
     def create_grid(self):
-        self.grid = []
-        for y in range(self.rows):
-            for x in range(self.cols):
-                self.grid.append({
-                    'x': x, 'y': y,
-                    'walls': {'top': True, 'right': True, 'bottom': True, 'left': True},
-                    'visited': False
-                })
-
-    def index(self, x, y):
-        if 0 <= x < self.cols and 0 <= y < self.rows:
-            return self.grid[y * self.cols + x]
-        return None
-
-    def reGenerate(self):
+        self.maze = MazeGrid(self.rows, self.cols)
+
+    def reGenerate(self, on_ready=None):
         if self.generated:
             self.reset_maze()
             self.level += 1
-            base = 6
-            self.rows = base + self.level * 2
-            self.cols = base + self.level * 2
+            self.variant = 0
+            self.rows, self.cols = level_size(self.level)
             print(f"[MazeBuilder] Nível {self.level} - Tamanho: {self.rows} x {self.cols}")
 
             self.create_grid()
+        else:
+            self.maze.reset()
 
-        for cell in self.grid:
-            cell['visited'] = False
-            cell['walls'] = {'top': True, 'right': True, 'bottom': True, 'left': True}
-
-        self.current = self.grid[0]
-        self.generate_maze()
-        self.build_mesh()
-        self.generated = True
+        prefetched = self.load_packed()
+        if prefetched is None and self.prefetcher:
+            prefetched = self.prefetcher.take(self.level, *self.prefetch_params(self.level))
+        if prefetched is None:
+            prefetched = self.load_cached()
+        self.start_build(on_ready, prefetched)
         
     def get_level(self):
         return self.level
     
-    def regenerate_current_level(self):
+    def regenerate_current_level(self, on_ready=None, new_layout=True):
         """Regenera o labirinto atual mantendo o mesmo nível"""
         # Não incrementar o nível, apenas regenerar
         if self.generated:
@@ -83,156 +273,732 @@ class MazeBuilder(types.KX_PythonComponent):
             # NÃO mudar self.level aqui!
             print(f"[MazeBuilder] Regenerando Nível {self.level} - Tamanho: {self.rows} x {self.cols}")
         
+        # Outra variante da semente = outro layout para o mesmo nível
+        if new_layout:
+            self.variant += 1
+
         # Resetar visitados e paredes
-        for cell in self.grid:
-            cell['visited'] = False
-            cell['walls'] = {'top': True, 'right': True, 'bottom': True, 'left': True}
-
-        self.current = self.grid[0]
-        self.generate_maze()
-        self.build_mesh()
-        self.generated = True
-
-    def generate_maze(self):
-        self.stack = [self.current]
-        self.current['visited'] = True
-
-        entrance_cell = self.index(random.randint(0, self.cols - 1), 0)
-        exit_cell = self.index(random.randint(0, self.cols - 1), self.rows - 1)
-
-        entrance_cell['walls']['top'] = False
-        exit_cell['walls']['bottom'] = False
-
-        entrance_cell['visited'] = False  
-        exit_cell['visited'] = False       
-
-        while self.stack:
-            neighbors = self.get_unvisited_neighbors(self.current)
-            if neighbors:
-                next_cell = random.choice(neighbors)
-                self.remove_walls(self.current, next_cell)
-                self.stack.append(self.current)
-                self.current = next_cell
-                self.current['visited'] = True
+        self.maze.reset()
+
+        # Não disputar CPU com a regeneração; o pedido é refeito ao terminar
+        if self.prefetcher:
+            self.prefetcher.cancel()
+        self.start_build(on_ready, self.load_packed() or self.load_cached())
+
+    def restart_level(self, on_ready=None, new_layout=False):
+        """
+        Reinicia o nível atual
+
+        Args:
+            on_ready: Chamado quando o nível estiver pronto para jogar
+            new_layout: True gera um labirinto novo; False reaproveita o layout
+                atual a partir do snapshot, sem refazer geração, malha ou física
+        """
+        if self.streamer:
+            if new_layout:
+                self.variant += 1
+                self.unload_all_chunks()
+            self.restart_endless(on_ready)
+            return
+
+        if new_layout or self.snapshot is None or self.is_building():
+            self.regenerate_current_level(on_ready, new_layout)
+            return
+
+        print(f"[MazeBuilder] Reiniciando Nível {self.level} com o mesmo layout")
+
+        # A malha viva já corresponde ao snapshot; só é refeita se a grade foi alterada
+        if self.snapshot.walls() != self.maze.walls:
+            self.snapshot.restore(self.maze)
+            self.target = self.front
+            self.build_mesh()
+            self.walls_changed()
+            self.plan_level_layout()
+        else:
+            self.maze.start = self.snapshot.start
+            self.maze.exit = self.snapshot.exit
+
+        self.update_positions()
+        if on_ready:
+            on_ready()
+
+    def start_build(self, on_ready=None, prefetched=None):
+        """
+        Inicia a geração + malha, avançada em fatias pelo update()
+
+        Args:
+            on_ready: Chamado (sem argumentos) quando o labirinto estiver pronto
+            prefetched: LevelData já gerado em segundo plano (só falta enviar a malha)
+        """
+        self.exit_position = None
+        self.start_position = None
+        # Primeiro nível vai direto para o buffer da frente; os demais para o de trás
+        self.target = self.back_buffer() if self.generated else self.front
+        self.build_job = self.build_steps(prefetched)
+        self.build_progress = 0.0
+        self.on_ready = on_ready
+        self.solver = None
+        self.level_layout = None
+        self.level_metrics = None
+        self.graph = None
+        self.pathfinder = None
+        self.flow_field = None
+
+        if self.frame_budget_ms <= 0:
+            self.advance_build(0)
+
+    def build_steps(self, prefetched=None):
+        """Etapas retomáveis: geração e entrada/saída (0 a 0.5), malha (0.5 a 0.95) e BFS da saída (0.95 a 1)"""
+        solver = None
+        if prefetched:
+            self.maze.assign(prefetched.walls, prefetched.start, prefetched.exit)
+            yield 0.5
+            # O worker já deixou as malhas no formato da engine (uploads)
+            meshes = prefetched.uploads if prefetched.uploads is not None else prefetched.meshes
+            self.built_meshes = None
+        elif self.difficulty_target:
+            # Amostragem por rejeição: candidatos medidos em lote até um cair nas faixas
+            search = difficulty_search.DifficultySearch(self.maze, self.current_seed(), self.difficulty_target,
+                                                        self.generator, self.layout)
+            for progress in search.compute_steps():
+                yield 0.5 * progress
+            self.level_metrics = search.metrics
+            meshes = None
+            self.built_meshes = {} if self.cache else None
+        else:
+            self.rng.seed(self.current_seed())
+            for progress in GENERATOR_STEPS[self.generator](self.maze, self.rng, open_ends=False):
+                yield 0.45 * progress
+            if self.layout == "diameter":
+                # O campo da segunda passada já é o solver
+                planner = DiameterLayout(self.maze)
+                for progress in planner.compute_steps():
+                    yield 0.45 + 0.05 * progress
+                solver = planner.field
             else:
-                self.current = self.stack.pop()
-
-        for i in range(self.cols):
-            cell = entrance_cell
-            if cell:
-                cell['walls']['bottom'] = False
-
-        for i in range(self.cols):
-            cell = exit_cell
-            if cell:
-                cell['walls']['top'] = False
-                
-                
-        self.exit_position = Vector((exit_cell['x'] * self.cell_size, exit_cell['y'] * self.cell_size, 0))
-        self.start_position = Vector((entrance_cell['x'] * self.cell_size, entrance_cell['y'] * self.cell_size, 0))
+                place_ends(self.maze, self.layout, self.rng)
+            meshes = None
+            # Malhas calculadas aqui são guardadas para gravar no cache
+            self.built_meshes = {} if self.cache else None
+        for progress in self.build_mesh_steps(meshes):
+            yield 0.5 + 0.45 * progress
+
+        # Campo de distâncias até a saída: dicas e caminho sem pathfinding por frame
+        if solver is None:
+            solver = DistanceField(self.maze)
+            for progress in solver.compute_steps():
+                yield 0.95 + 0.05 * progress
+        self.solver = solver
+        self.plan_level_layout()
+
+    def _run_budgeted(self, steps, budget_ms, on_progress=None):
+        """Avança o gerador steps até acabar ou estourar budget_ms (<= 0 = sem limite); True se acabou"""
+        deadline = time.perf_counter() + budget_ms / 1000 if budget_ms > 0 else None
+        for progress in steps:
+            if on_progress:
+                on_progress(progress)
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+        return True
+
+    def set_build_progress(self, progress):
+        self.build_progress = progress
+
+    def advance_build(self, budget_ms):
+        """Avança a construção até estourar o orçamento; retorna True ao terminar"""
+        if not self._run_budgeted(self.build_job, budget_ms, self.set_build_progress):
+            return False
+
+        self.build_job = None
+        self.build_progress = 1.0
+        if self.streamer:
+            x, y = start_cell(self.chunk_size)
+            self.start_position = Vector((x * self.cell_size, y * self.cell_size, 0))
+            self.generated = True
+        else:
+            if self.target != self.front:
+                self.swap_buffers()
+            self.update_positions()
+            self.snapshot = MazeSnapshot.capture(self.maze)
+            self.store_cached()
+            self.generated = True
+            self.request_prefetch()
+
+        on_ready, self.on_ready = self.on_ready, None
+        if on_ready:
+            on_ready()
+        return True
+
+    def back_buffer(self):
+        return (self.front + 1) % len(self.roots)
+
+    def swap_buffers(self):
+        """Mostra/ativa a colisão do buffer recém-montado e esconde o antigo"""
+        self.set_buffer_active(self.target, True)
+        self.set_buffer_active(self.front, False)
+        self.front = self.target
+        self.chunk_objects = self.chunk_sets[self.front]
+
+    def set_buffer_active(self, index, active):
+        root = self.roots[index]
+        chunks = self.chunk_sets[index]
+        targets = list(chunks.values()) if chunks else [root]
+        for obj in targets:
+            obj.setVisible(active, False)
+            if active:
+                obj.restorePhysics()
+            else:
+                obj.suspendPhysics()
+
+    def get_maze_root(self):
+        """Objeto (buffer da frente) ao qual as posições locais se referem"""
+        return self.roots[self.front] if self.roots else self.object
+
+    def current_seed(self):
+        return level_seed(self.base_seed, self.level, self.variant)
+
+    def mesh_params(self):
+        """Parâmetros que mudam a malha gerada (parte da chave do cache)"""
+        chunk_size = self.chunk_size if self.get_chunk_template() else 0
+        return (self.cell_size, self.wall_thickness, self.wall_height,
+                self.merge_walls, self.cull_hidden_faces, chunk_size)
+
+    def prefetch_params(self, level, variant=0):
+        """Argumentos de build_level_data para um nível (além do próprio nível)"""
+        seed = level_seed(self.base_seed, level, variant)
+        return (seed,) + self.mesh_params() + (self.cache_dir, self.cache_max_bytes, self.generator, self.layout,
+                                              self.difficulty)
+
+    def request_prefetch(self):
+        if self.prefetcher and not (self.level_pack and self.level_pack.has_level(self.level + 1)):
+            self.prefetcher.request(self.level + 1, *self.prefetch_params(self.level + 1))
+
+    def load_packed(self):
+        """LevelData do nível/variante atual vindo do pacote de níveis, ou None"""
+        if not self.level_pack:
+            return None
+        snap = self.level_pack.snapshot(self.level, self.variant)
+        if snap is None:
+            return None
+        if (snap.rows, snap.cols) != (self.rows, self.cols):
+            # O pacote pode ter tamanhos próprios (ex.: níveis bônus)
+            self.rows, self.cols = snap.rows, snap.cols
+            self.create_grid()
+        return LevelData(self.level, snap.rows, snap.cols, snap.walls(), snap.start, snap.exit,
+                         None, from_cache=True)
+
+    def load_cached(self):
+        """LevelData do nível/variante atual vindo do cache em disco, ou None"""
+        if not self.cache:
+            return None
+        return load_cached_level(self.cache, self.level, self.current_seed(), *self.mesh_params(),
+                                 generator=self.generator, layout=self.layout, difficulty=self.difficulty)
+
+    def store_cached(self):
+        """Grava no cache o labirinto recém-gerado no thread principal"""
+        meshes, self.built_meshes = self.built_meshes, None
+        if not self.cache or meshes is None:
+            return
+        if None in meshes:
+            meshes = meshes[None]
+        elif not meshes:
+            meshes = None
+        if meshes is None and mesh_arrays:
+            return
+        key = level_cache_key(self.level, self.current_seed(), *self.mesh_params(),
+                              generator=self.generator, layout=self.layout, difficulty=self.difficulty)
+        if self.prefetcher:
+            self.prefetcher.run(self.cache.store, key, self.snapshot, meshes)
+        else:
+            self.cache.store(key, self.snapshot, meshes)
+
+    def restart_endless(self, on_ready=None):
+        """Carrega a vizinhança do ponto de partida (com tela de carregamento) e volta a ele"""
+        self.start_position = None
+        self.exit_position = None
+        self.stream_job = None
+        self.stream_center = world_chunk(*start_cell(self.chunk_size), self.chunk_size)
+        if self.generator == "eller" and (self.bands is None or self.bands.seed != self.world_seed()):
+            # Faixas de uma linha de chunks; as recentes cobrem a vizinhança carregada
+            self.bands = EllerBandStream(self.world_seed(), self.endless_width * self.chunk_size,
+                                         self.chunk_size, 2 * self.streamer.radius + 2)
+        self.build_job = self.stream_steps(self.stream_center)
+        self.build_progress = 0.0
+        self.on_ready = on_ready
+
+        if self.frame_budget_ms <= 0:
+            self.advance_build(0)
+
+    def world_seed(self):
+        # Nível 0 fica reservado para o mundo do modo infinito
+        return level_seed(self.base_seed, 0, self.variant)
+
+    def focus_chunk(self):
+        """Chunk em que está o objeto seguido pelo streaming, ou None"""
+        focus = self.scene.objects.get(self.endless_focus)
+        if not focus:
+            return None
+        local = focus.worldPosition - self.object.worldPosition
+        x = math.floor(local.x / self.cell_size + 0.5)
+        y = math.floor(local.y / self.cell_size + 0.5)
+        return world_chunk(x, y, self.chunk_size)
+
+    def update_streaming(self):
+        center = self.focus_chunk()
+        if center is not None and center != self.stream_center:
+            self.stream_center = center
+            self.stream_job = self.stream_steps(center)
+        if not self.stream_job:
+            return
+
+        if self._run_budgeted(self.stream_job, self.frame_budget_ms):
+            self.stream_job = None
+
+    def stream_steps(self, center):
+        """Carrega, um chunk por etapa, o que falta ao redor de center"""
+        streamer = self.streamer
+        wanted = streamer.wanted(center)
+        keep = set(wanted)
+        # Mais próximos por último = os mais recentes para o LRU
+        streamer.touch(reversed(wanted))
+
+        missing = [key for key in wanted if key not in streamer]
+        for i, key in enumerate(missing):
+            # Despejar antes de criar mantém memória e objetos dentro do orçamento
+            for old, _grid in streamer.evict(keep, reserve=1):
+                self.unload_world_chunk(old)
+            grid, nbytes = self.load_world_chunk(key)
+            streamer.add(key, grid, nbytes)
+            yield (i + 1) / len(missing)
+
+        for old, _grid in streamer.evict(keep):
+            self.unload_world_chunk(old)
+        yield 1.0
+
+    def load_world_chunk(self, key):
+        """Gera e monta o chunk key; retorna (grade, bytes ocupados), ou (None, 0) fora do mundo"""
+        cx, cy = key
+        size = self.chunk_size
+        cs = self.cell_size
+        if self.bands:
+            grid = self.bands.chunk(cx, cy)
+            if grid is None:
+                return None, 0
+            # A borda direita do último chunk é o fim do mundo: não tem vizinho para desenhá-la
+            owned = owned_walls(grid, right=cx < self.bands.chunk_count() - 1)
+        else:
+            grid = generate_chunk(self.world_seed(), cx, cy, size, self.generator)
+            owned = owned_walls(grid)
+
+        if self.free_chunks:
+            obj = self.free_chunks.pop()
+        else:
+            obj = self.scene.addObject(self.chunk_template, self.object)
+            obj.setParent(self.object, False, False)
+        obj.localPosition = (cx * size * cs, cy * size * cs, 0)
+        nbytes = self.upload_world_chunk(obj, key, owned)
+        obj.setVisible(True, False)
+        obj.restorePhysics()
+        self.chunk_objects[key] = obj
+        return grid, nbytes + len(grid.walls)
+
+    def upload_world_chunk(self, obj, key, grid):
+        """Malha e física de um chunk do modo infinito; retorna os bytes dos buffers"""
+        material = self.get_wall_material()
+        cs = self.cell_size
+        wt = self.wall_thickness
+        wh = self.wall_height
+        if mesh_arrays:
+            arrays = mesh_arrays.build_mesh_arrays(grid, cs, wt, wh, self.merge_walls, self.cull_hidden_faces)
+            self.upload_chunk(obj, key, material, arrays)
+            return arrays.nbytes
+
+        builder = types.KX_MeshBuilder(f"MazeChunk_{key[0]}_{key[1]}", self.scene)
+        slot = builder.addSlot(material, 0)
+        vertex_count, triangle_count = self.add_wall_boxes(slot, cs, wt, wh, grid)
+        obj.replaceMesh(builder.finish(), 1, 0)
+        obj.reinstancePhysicsMesh(dupli=False)
+        # Mesmo tamanho que os buffers float32/uint32 do caminho NumPy
+        return vertex_count * 24 + triangle_count * 12
+
+    def unload_world_chunk(self, key):
+        """Esconde o objeto do chunk e o guarda para ser reaproveitado"""
+        obj = self.chunk_objects.pop(key, None)
+        if obj is None:
+            return
+        obj.setVisible(False, False)
+        obj.suspendPhysics()
+        self.free_chunks.append(obj)
+
+    def unload_all_chunks(self):
+        for key, _grid in self.streamer.clear():
+            self.unload_world_chunk(key)
+        self.stream_job = None
+        self.stream_center = None
+
+    def get_world_chunk(self, cx, cy):
+        """Grade (MazeGrid) de um chunk carregado do modo infinito, ou None"""
+        return self.streamer.get((cx, cy)) if self.streamer else None
+
+    def is_building(self):
+        return self.build_job is not None
+
+    def get_build_progress(self):
+        """Progresso da construção atual, de 0.0 a 1.0"""
+        return self.build_progress
+
+    def update_positions(self):
+        """Converte as células de entrada/saída do núcleo em posições locais"""
+        self.exit_position = Vector(self.maze.exit_position(self.cell_size))
+        self.start_position = Vector(self.maze.start_position(self.cell_size))
             
+    def cell_at_world(self, position):
+        """Índice da célula sob uma posição do mundo, ou None fora do labirinto"""
+        if self.maze is None or self.streamer:
+            return None
+        local = Vector(position) - self.get_maze_root().worldPosition
+        x = math.floor(local.x / self.cell_size + 0.5)
+        y = math.floor(local.y / self.cell_size + 0.5)
+        return self.maze.index(x, y)
+
+    def cell_world_position(self, cell):
+        return self.get_maze_root().worldPosition + Vector(self.maze.cell_position(cell, self.cell_size))
+
+    def get_solver(self):
+        """DistanceField do labirinto atual (BFS a partir da saída), ou None durante a montagem"""
+        return self.solver if self.solver and self.solver.ready else None
+
+    def get_distance_to_exit(self, position):
+        """Passos (células) até a saída a partir de uma posição do mundo; -1 se desconhecido"""
+        solver = self.get_solver()
+        return solver.distance(self.cell_at_world(position)) if solver else -1
+
+    def get_next_hint_position(self, position):
+        """Centro (mundo) da próxima célula rumo à saída, para dicas; None se não houver"""
+        solver = self.get_solver()
+        if not solver:
+            return None
+        cell = solver.next_step(self.cell_at_world(position))
+        return self.cell_world_position(cell) if cell is not None else None
+
+    def is_on_solution_path(self, position):
+        """True se a posição está no caminho mais curto entre a entrada e a saída"""
+        solver = self.get_solver()
+        return bool(solver) and solver.on_path(self.cell_at_world(position))
+
+    def plan_level_layout(self):
+        """Checkpoints e coletáveis a partir do solver; fluxo próprio da semente, igual com cache ou pacote"""
+        if not (self.checkpoint_count or self.collectible_count):
+            self.level_layout = None
+            return
+        rng = MazeRandom(self.current_seed(), stream=1)
+        self.level_layout = plan_layout(self.solver, self.checkpoint_count, self.collectible_count, rng)
+
+    def get_maze_graph(self):
+        """MazeGraph (corredores contraídos) do labirinto atual, montado na primeira chamada"""
+        if self.graph is None and self.get_solver() and not self.streamer:
+            self.graph = MazeGraph(self.maze)
+        return self.graph
+
+    def get_path_between(self, position, target):
+        """Células (centros no mundo) do caminho mais curto entre duas posições; [] fora do labirinto"""
+        graph = self.get_maze_graph()
+        source, goal = self.cell_at_world(position), self.cell_at_world(target)
+        if not graph or source is None or goal is None:
+            return []
+        return [self.cell_world_position(cell) for cell in graph.shortest_path(source, goal)]
+
+    def get_pathfinder(self):
+        """HierarchicalPathfinder (HPA*, clusters do tamanho dos chunks) do labirinto atual"""
+        if self.pathfinder is None and self.get_solver() and not self.streamer:
+            self.pathfinder = HierarchicalPathfinder(self.maze, self.chunk_size or 16)
+        return self.pathfinder
+
+    def get_next_position_towards(self, position, target):
+        """Centro (mundo) da próxima célula de position rumo a target, para inimigos; None se não houver"""
+        pathfinder = self.get_pathfinder()
+        source, goal = self.cell_at_world(position), self.cell_at_world(target)
+        if not pathfinder or source is None or goal is None:
+            return None
+        cell = pathfinder.next_step(source, goal)
+        return self.cell_world_position(cell) if cell is not None else None
+
+    def get_flow_field(self):
+        """FlowFieldService rumo ao objeto chase_target, criado na primeira chamada e mantido pelo update()"""
+        if self.flow_field is None and self.get_solver() and not self.streamer:
+            self.flow_field = FlowFieldService(self.maze)
+            self.update_flow_field()
+        return self.flow_field
+
+    def update_flow_field(self):
+        """Segue a célula do chase_target e avança o BFS pendente dentro do orçamento do frame"""
+        target = self.scene.objects.get(self.chase_target)
+        if target:
+            self.flow_field.set_target(self.cell_at_world(target.worldPosition))
+        if self.flow_field.busy:
+            self._run_budgeted(self.flow_field.compute_steps(), self.frame_budget_ms)
+
+    def get_chase_position(self, position):
+        """Centro (mundo) da próxima célula rumo ao chase_target, em O(1) para qualquer número de agentes"""
+        flow_field = self.get_flow_field()
+        if not flow_field:
+            return None
+        cell = flow_field.next_step(self.cell_at_world(position))
+        return self.cell_world_position(cell) if cell is not None else None
+
+    def get_level_metrics(self):
+        """Métricas de dificuldade do labirinto atual (maze.analytics), ou None sem NumPy/durante a montagem"""
+        if self.level_metrics is None and analytics and self.get_solver() and not self.streamer:
+            self.level_metrics = analytics.analyze([self.maze]).row(0)
+        return self.level_metrics
+
+    def get_checkpoint_positions(self):
+        """Centros (mundo) dos checkpoints, da entrada para a saída"""
+        if not self.level_layout:
+            return []
+        return [self.cell_world_position(cell) for cell in self.level_layout.checkpoints]
+
+    def get_collectible_positions(self):
+        """Centros (mundo) dos coletáveis planejados"""
+        if not self.level_layout:
+            return []
+        return [self.cell_world_position(cell) for cell in self.level_layout.collectibles]
+
     def get_exit_position(self):
         return self.exit_position
     
     def get_start_position(self):
         return self.start_position
-    
-    def get_unvisited_neighbors(self, cell):
-        x, y = cell['x'], cell['y']
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        neighbors = []
-
-        for dx, dy in directions:
-            neighbor = self.index(x + dx, y + dy)
-            if neighbor and not neighbor['visited']:
-                neighbors.append(neighbor)
-        return neighbors
-
-    def remove_walls(self, a, b):
-        dx = a['x'] - b['x']
-        dy = a['y'] - b['y']
-
-        if dx == 1:
-            a['walls']['left'] = False
-            b['walls']['right'] = False
-        elif dx == -1:
-            a['walls']['right'] = False
-            b['walls']['left'] = False
-        elif dy == 1:
-            a['walls']['bottom'] = False
-            b['walls']['top'] = False
-        elif dy == -1:
-            a['walls']['top'] = False
-            b['walls']['bottom'] = False
 
-    def build_mesh(self):
-        self.mesh_builder = types.KX_MeshBuilder("MazeMesh", self.scene)
+    def get_exit_world_position(self):
+        if self.exit_position is None:
+            return None
+        return self.get_maze_root().worldPosition + self.exit_position
 
+    def get_start_world_position(self):
+        if self.start_position is None:
+            return None
+        return self.get_maze_root().worldPosition + self.start_position
+
+    def get_wall_material(self):
         if self.wall_material:
-            material = self.scene.materials.get(self.wall_material, None)
-        else:
-            material = self.object.meshes[0].materials[0] if self.object.meshes else None
+            return self.scene.materials.get(self.wall_material, None)
+        return self.object.meshes[0].materials[0] if self.object.meshes else None
 
+    def get_chunk_template(self):
+        """Objeto modelo (em camada inativa) usado para instanciar os chunks"""
+        if not self.chunk_size or not self.chunk_object or not mesh_arrays:
+            return None
+        template = self.scene.objectsInactive.get(self.chunk_object, None)
+        if not template:
+            print(f"[MazeBuilder] Objeto de chunk '{self.chunk_object}' não encontrado, usando malha única.")
+            self.chunk_size = 0
+        return template
+
+    def build_mesh(self):
+        for _progress in self.build_mesh_steps():
+            pass
+
+    def build_mesh_steps(self, prebuilt=None):
+        """
+        Monta a malha em etapas (uma por chunk), devolvendo a fração pronta
+
+        Args:
+            prebuilt: MeshArrays ou {(cx, cy): MeshArrays} já calculados por um worker
+        """
+        material = self.get_wall_material()
         if not material:
             print("[MazeBuilder] Material não encontrado.")
             return
 
+        cs = self.cell_size
+        center_x = -(self.cols * cs) / 2
+        center_y = -(self.rows * cs) / 2
+        self.roots[self.target].localPosition = (center_x, center_y, 0)
+
+        template = self.get_chunk_template()
+        if template:
+            yield from self.chunk_steps(material, template, prebuilt=prebuilt, buffer=self.target)
+        else:
+            yield from self.single_mesh_steps(material, prebuilt, self.target)
+
+    def build_single_mesh(self, material, prebuilt=None, buffer=0):
+        for _progress in self.single_mesh_steps(material, prebuilt, buffer):
+            pass
+
+    def single_mesh_steps(self, material, prebuilt=None, buffer=0):
+        """Malha única; o envio ao slot é fatiado em blocos de UPLOAD_BLOCK vértices"""
+        self.mesh_builder = types.KX_MeshBuilder("MazeMesh", self.scene)
         slot = self.mesh_builder.addSlot(material, 0)
 
         cs = self.cell_size
         wt = self.wall_thickness
         wh = self.wall_height
 
-        vertices = []
-        indices = []
-        vertex_offset = 0
+        # merge_walls: uma caixa por sequência de paredes colineares em vez de uma por lado de célula
+        # cull_hidden_faces: descarta base e tampas encostadas em outras paredes
+        if prebuilt is not None:
+            yield from self.upload_steps(slot, prebuilt)
+        elif mesh_arrays:
+            arrays = mesh_arrays.build_mesh_arrays(
+                self.maze, cs, wt, wh, self.merge_walls, self.cull_hidden_faces)
+            if self.built_meshes is not None:
+                self.built_meshes[None] = arrays
+            yield from self.upload_steps(slot, arrays)
+        else:
+            self.add_wall_boxes(slot, cs, wt, wh)
+
+        mesh = self.mesh_builder.finish()
+        root = self.roots[buffer]
+        root.replaceMesh(mesh, 1, 0)
+        root.reinstancePhysicsMesh(dupli=False)
+
+    def build_chunks(self, material, template, only=None, buffer=None):
+        buffer = self.front if buffer is None else buffer
+        for _progress in self.chunk_steps(material, template, only, buffer=buffer):
+            pass
+
+    def chunk_steps(self, material, template, only=None, prebuilt=None, buffer=0):
+        """Uma malha e uma forma física por chunk de chunk_size x chunk_size células"""
+        if isinstance(prebuilt, dict):
+            chunk_arrays = iter(prebuilt.items())
+        else:
+            chunk_arrays = mesh_arrays.iter_chunk_mesh_arrays(
+                self.maze, self.cell_size, self.wall_thickness, self.wall_height,
+                self.chunk_size, self.merge_walls, self.cull_hidden_faces, only)
+
+        # O objeto do labirinto só serve de pai; quem desenha e colide são os chunks
+        root = self.roots[buffer]
+        chunk_objects = self.chunk_sets[buffer]
+        hidden = buffer != self.front
+        root.setVisible(False, False)
+        root.suspendPhysics()
+
+        n_cx, n_cy = mesh_arrays.chunk_count(self.maze, self.chunk_size)
+        total = len(only) if only is not None else n_cx * n_cy
+        built = set()
+        for key, arrays in chunk_arrays:
+            obj = chunk_objects.get(key)
+            if obj is None:
+                obj = self.scene.addObject(template, root)
+                obj.setParent(root, False, False)
+                chunk_objects[key] = obj
+            self.upload_chunk(obj, key, material, arrays)
+            if self.built_meshes is not None and prebuilt is None and only is None:
+                self.built_meshes[key] = arrays
+            if hidden:
+                obj.setVisible(False, False)
+                obj.suspendPhysics()
+            built.add(key)
+            yield min(1.0, len(built) / total)
+
+        # Chunks que ficaram fora do novo labirinto (ex.: nível menor) ou sem nenhuma parede
+        for key in list(chunk_objects if only is None else only):
+            if key not in built and key in chunk_objects:
+                chunk_objects.pop(key).endObject()
+
+    def upload_chunk(self, obj, key, material, arrays):
+        builder = types.KX_MeshBuilder(f"MazeChunk_{key[0]}_{key[1]}", self.scene)
+        slot = builder.addSlot(material, 0)
+        self.upload_mesh_arrays(slot, arrays)
+        obj.replaceMesh(builder.finish(), 1, 0)
+        obj.reinstancePhysicsMesh(dupli=False)
 
-        for cell in self.grid:
-            x = cell['x'] * cs
-            y = cell['y'] * cs
-
-            for side in ['top', 'bottom', 'left', 'right']:
-                if cell['walls'][side]:
-                    if side == 'top':
-                        px, py = x, y + cs / 2
-                        w, t = cs, wt
-                    elif side == 'bottom':
-                        px, py = x, y - cs / 2
-                        w, t = cs, wt
-                    elif side == 'left':
-                        px, py = x - cs / 2, y
-                        w, t = wt, cs
-                    elif side == 'right':
-                        px, py = x + cs / 2, y
-                        w, t = wt, cs
-
-                    v_count = self.add_wall_data(vertices, px, py, w, t, wh, side)
-                    for i in range(0, v_count, 4):
-                        indices.append((vertex_offset + i, vertex_offset + i + 1, vertex_offset + i + 2))
-                        indices.append((vertex_offset + i, vertex_offset + i + 2, vertex_offset + i + 3))
-
-
-                    vertex_offset += v_count
+    def rebuild_chunk(self, cx, cy):
+        """Reconstrói só a malha/física de um chunk (ex.: após mudar paredes)"""
+        template = self.get_chunk_template()
+        material = self.get_wall_material()
+        if template and material:
+            self.build_chunks(material, template, only={(cx, cy)})
 
+    def chunk_of_cell(self, x, y):
+        if not self.chunk_size:
+            return 0, 0
+        return x // self.chunk_size, y // self.chunk_size
+
+    def rebuild_cells(self, cells):
+        """Reconstrói só as malhas que contêm as células (x, y); passe as duas células de cada parede alterada"""
+        self.walls_changed()
+        template = self.get_chunk_template()
+        material = self.get_wall_material()
+        if not material:
+            return
+        if not template:
+            self.build_single_mesh(material, buffer=self.front)
+            return
+        self.build_chunks(material, template, only={self.chunk_of_cell(x, y) for x, y in cells})
+
+    def walls_changed(self):
+        """Paredes do labirinto mudaram: refaz o solver e invalida grafo, pathfinder e flow field"""
+        self.solver = DistanceField(self.maze).compute()
+        self.level_metrics = None
+        self.graph = None
+        if self.pathfinder:
+            self.pathfinder.invalidate()
+        if self.flow_field:
+            self.flow_field.invalidate()
+
+    def upload_mesh_arrays(self, slot, arrays):
+        for _progress in self.upload_steps(slot, arrays):
+            pass
+
+    def upload_steps(self, slot, arrays):
+        """
+        Envia uma malha ao slot, devolvendo a fração enviada
+
+        MeshUpload (convertido pelo worker) vai direto; MeshArrays é convertido
+        aqui em blocos de UPLOAD_BLOCK vértices (e triângulos), um por etapa.
+        """
+        if isinstance(arrays, MeshUpload):
+            self.upload_vertices(slot, arrays.vertices)
+            self.upload_indices(slot, arrays.indices)
+            yield 1.0
+            return
+        vertices = arrays.vertex_count
+        triangles = arrays.triangle_count
+        total = vertices + triangles
+        for first in range(0, vertices, UPLOAD_BLOCK):
+            self.upload_vertices(slot, mesh_arrays.vertex_dicts(arrays, first, first + UPLOAD_BLOCK))
+            yield min(vertices, first + UPLOAD_BLOCK) / total
+        for first in range(0, triangles, UPLOAD_BLOCK):
+            slot.addIndex(arrays.indices[first:first + UPLOAD_BLOCK].reshape(-1).tolist())
+            yield (vertices + min(triangles, first + UPLOAD_BLOCK)) / total
+        yield 1.0
+
+    def upload_indices(self, slot, indices):
+        """Índices planos (3 por triângulo) em poucas chamadas de addIndex"""
+        for first in range(0, len(indices), INDEX_BLOCK):
+            slot.addIndex(indices[first:first + INDEX_BLOCK])
+
+    def upload_vertices(self, slot, vertices):
+        """Vértices {'pos', 'normal'} em uma chamada quando a engine tem addVerticesBatch"""
         if hasattr(slot, 'addVerticesBatch'):
             slot.addVerticesBatch(vertices)
         else:
             for vertex in vertices:
                 slot.addVertex(vertex['pos'], normal=vertex['normal'])
 
-        for tri in indices:
-            slot.addIndex(tri)
+    def add_wall_boxes(self, slot, cs, wt, wh, grid=None):
+        """Caminho em Python puro, usado quando o NumPy não está disponível"""
+        vertices = []
+        indices = []
+        vertex_offset = 0
 
-        mesh = self.mesh_builder.finish()
-        self.object.replaceMesh(mesh, 1, 0)
-        self.object.reinstancePhysicsMesh(dupli=False)
+        grid = self.maze if grid is None else grid
+        boxes = wall_boxes(grid, cs, wt, self.merge_walls, self.cull_hidden_faces)
+        for px, py, w, t, side, faces in boxes:
+            v_count = self.add_wall_data(vertices, px, py, w, t, wh, side, faces)
+            for i in range(vertex_offset, vertex_offset + v_count, 4):
+                indices.extend((i, i + 1, i + 2, i, i + 2, i + 3))
 
-        center_x = -(self.cols * cs) / 2
-        center_y = -(self.rows * cs) / 2
-        self.object.localPosition = (center_x, center_y, 0)
+            vertex_offset += v_count
 
-    def add_wall_data(self, vertices, x, y, width, thickness, height, side):
-        """Cria uma parede como uma caixa (paralelepípedo com 6 lados)"""
+        self.upload_vertices(slot, vertices)
+        self.upload_indices(slot, indices)
+        return len(vertices), len(indices) // 3
+
+    def add_wall_data(self, vertices, x, y, width, thickness, height, side, faces=FACE_ALL):
+        """Cria uma parede como uma caixa (paralelepípedo), só com as faces da máscara"""
         half_w = width / 2
         half_t = thickness / 2
 
@@ -252,23 +1018,25 @@ class MazeBuilder(types.KX_PythonComponent):
             (min_x, max_y, max_z),  # 7
         ]
 
-        faces = [
+        box_faces = [
             # Frente
-            ((0, 1, 5, 4), (0, -1, 0)),
+            (FACE_FRONT, (0, 1, 5, 4), (0, -1, 0)),
             # Trás
-            ((2, 3, 7, 6), (0, 1, 0)),
+            (FACE_BACK, (2, 3, 7, 6), (0, 1, 0)),
             # Direita
-            ((1, 2, 6, 5), (1, 0, 0)),
+            (FACE_RIGHT, (1, 2, 6, 5), (1, 0, 0)),
             # Esquerda
-            ((3, 0, 4, 7), (-1, 0, 0)),
+            (FACE_LEFT, (3, 0, 4, 7), (-1, 0, 0)),
             # Topo
-            ((4, 5, 6, 7), (0, 0, 1)),
+            (FACE_TOP, (4, 5, 6, 7), (0, 0, 1)),
             # Base
-            ((0, 3, 2, 1), (0, 0, -1)),
+            (FACE_BOTTOM, (0, 3, 2, 1), (0, 0, -1)),
         ]
 
         start_index = len(vertices)
-        for quad, normal in faces:
+        for face, quad, normal in box_faces:
+            if not faces & face:
+                continue
             v0, v1, v2, v3 = [v[i] for i in quad]
             vertices.extend([
                 {'pos': v0, 'normal': normal},
@@ -276,12 +1044,23 @@ class MazeBuilder(types.KX_PythonComponent):
                 {'pos': v2, 'normal': normal},
                 {'pos': v3, 'normal': normal},
             ])
-        return 24
+        return len(vertices) - start_index
 
 
     def reset_maze(self):
         if self.mesh_builder:
             self.mesh_builder = None
 
+    def dispose(self):
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+        if self.level_pack:
+            self.level_pack.close()
+
     def update(self):
-        pass
+        if self.build_job:
+            self.advance_build(self.frame_budget_ms)
+        elif self.streamer:
+            self.update_streaming()
+        elif self.flow_field:
+            self.update_flow_field()
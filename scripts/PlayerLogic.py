@@ -24,10 +24,9 @@ class Player(types.KX_PythonComponent):
                 
     def update(self):
         if self.start_pos is None and self.maze_builder:
-            local_pos = self.maze_builder.get_start_position()
-            if local_pos:
-                maze_world_pos = self.maze_obj.worldPosition
-                self.start_pos = maze_world_pos + local_pos
+            start_world = self.maze_builder.get_start_world_position()
+            if start_world:
+                self.start_pos = start_world
 
                 print("[SensorComp] Posição de saída (world):", self.start_pos)
 
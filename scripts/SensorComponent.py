@@ -1,6 +1,7 @@
 from Range import *
 from collections import OrderedDict
 from mathutils import Vector
+from maze.layout import exit_marker_offset
 
 class SensorExit(types.KX_PythonComponent):
     args = OrderedDict({})
@@ -53,24 +54,25 @@ class SensorExit(types.KX_PythonComponent):
     def generate_next_level(self):
         """Gera o próximo nível (chamado pelo botão do menu)"""
         print("[SensorExit] Gerando próximo nível...")
-        self.maze_builder.reGenerate()
-        
+        self.exit_pos = None
+        self.maze_builder.reGenerate(on_ready=self.on_level_ready)
+
+    def on_level_ready(self):
+        """Chamado pelo MazeBuilder quando o novo labirinto termina de ser montado"""
         self.update_exit_position()
         
         # Mover o jogador para o novo ponto de início
         player = self.scene.objects.get("Player")
-        start_local = self.maze_builder.get_start_position()
-        if start_local and player:
-            start_world = self.maze_obj.worldPosition + start_local
+        start_world = self.maze_builder.get_start_world_position()
+        if start_world and player:
             player.worldPosition = start_world + Vector((0, 0, 0))
             print("[SensorExit] Player movido para o novo ponto de início:", start_world)
         
         self.activated = False
 
     def update_exit_position(self):
-        local_pos = self.maze_builder.get_exit_position()
-        if local_pos:
-            maze_world_pos = self.maze_obj.worldPosition
-            self.exit_pos = maze_world_pos + local_pos
-            self.object.worldPosition = self.exit_pos + Vector((0, 1.5, 1))
+        exit_world = self.maze_builder.get_exit_world_position()
+        if exit_world:
+            self.exit_pos = exit_world
+            self.object.worldPosition = self.exit_pos + Vector(exit_marker_offset(self.maze_builder.maze))
             print("[SensorExit] Cubo de saída movido para:", self.exit_pos)
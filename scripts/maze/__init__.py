@@ -0,0 +1,43 @@
+"""
+Núcleo do labirinto do MazeGalaxy
+Geração e consultas de paredes em Python puro, sem dependências da engine
+"""
+
+from .grid import (
+    MazeGrid, level_size, level_seed, back_directions,
+    WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT, WALL_ALL, VISITED, WALL_SIDES,
+)
+from .generators import (
+    generate_backtracker, backtracker_steps, open_entrance_and_exit,
+    EllerGenerator, eller_steps, generate_eller,
+    kruskal_steps, prim_steps, wilson_steps, growing_tree_steps,
+    GENERATOR_STEPS, register_generator, generate,
+)
+from .rng import MazeRandom, ensure_rng
+from .solver import DistanceField
+from .layout import LAYOUTS, DiameterLayout, LevelLayout, place_ends, plan_layout
+from .graph import MazeGraph
+from .hpa import HierarchicalPathfinder
+from .flowfield import FlowFieldService
+
+__all__ = [
+    'MazeGrid', 'level_size', 'level_seed',
+    'WALL_TOP', 'WALL_RIGHT', 'WALL_BOTTOM', 'WALL_LEFT', 'WALL_ALL', 'VISITED', 'WALL_SIDES',
+    'generate_backtracker', 'backtracker_steps', 'open_entrance_and_exit',
+    'EllerGenerator', 'eller_steps', 'generate_eller',
+    'kruskal_steps', 'prim_steps', 'wilson_steps', 'growing_tree_steps',
+    'GENERATOR_STEPS', 'register_generator', 'generate',
+    'MazeRandom', 'ensure_rng',
+    'DistanceField',
+    'LAYOUTS', 'DiameterLayout', 'LevelLayout', 'place_ends', 'plan_layout',
+    'MazeGraph', 'HierarchicalPathfinder', 'FlowFieldService',
+]
+
+# Geradores vetorizados só existem com NumPy
+try:
+    from .generator_arrays import binary_tree_steps, sidewinder_steps
+except ImportError:
+    pass
+else:
+    register_generator('binary_tree', binary_tree_steps)
+    register_generator('sidewinder', sidewinder_steps)
@@ -0,0 +1,215 @@
+"""
+Métricas de dificuldade em lote (NumPy)
+Vários labirintos do mesmo tamanho empilhados em um array (n, rows, cols):
+grau de cada célula, becos, bifurcações e comprimento da solução de todos
+de uma vez. O BFS anda com a fronteira de todos os labirintos junta, então
+o custo por passo não depende de quantos labirintos há no lote.
+"""
+
+import numpy as np
+
+from .grid import WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+
+# Métricas por labirinto em MazeMetrics (e nomes aceitos em DifficultyTarget)
+METRICS = ('path_length', 'path_ratio', 'dead_ends', 'dead_end_ratio', 'junctions', 'branching')
+
+
+def stack_walls(grids):
+    """(n, rows, cols) uint8 com as paredes de grades do mesmo tamanho"""
+    rows, cols = grids[0].rows, grids[0].cols
+    if any((g.rows, g.cols) != (rows, cols) for g in grids):
+        raise ValueError("Todas as grades do lote precisam ter o mesmo tamanho")
+    data = b''.join(bytes(g.walls) for g in grids)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(grids), rows, cols)
+
+
+def passages(walls):
+    """(east, north): passagens abertas para x + 1 e para y + 1; fechada se qualquer lado tiver parede"""
+    east = ((walls[:, :, :-1] & WALL_RIGHT) | (walls[:, :, 1:] & WALL_LEFT)) == 0
+    north = ((walls[:, :-1, :] & WALL_TOP) | (walls[:, 1:, :] & WALL_BOTTOM)) == 0
+    return east, north
+
+
+class BatchGraph:
+    """
+    Passagens de um lote como tabela de vizinhos plana, para o BFS em lote
+
+    neighbors[i] tem os 4 vizinhos abertos da célula global i (labirinto *
+    células + índice local); passagens fechadas apontam para uma célula
+    sentinela extra, sempre marcada como visitada.
+    """
+
+    def __init__(self, walls):
+        n, rows, cols = walls.shape
+        self.count = n
+        self.cells = rows * cols
+        total = n * self.cells
+        east, north = passages(walls)
+
+        self.neighbors = np.full((total, 4), total, dtype=np.int64)
+        degree = np.zeros(walls.shape, dtype=np.int8)
+        index = np.arange(total, dtype=np.int64)
+        for k, (delta, region, values) in enumerate((
+                (1, (slice(None), slice(None), slice(None, -1)), east),
+                (-1, (slice(None), slice(None), slice(1, None)), east),
+                (cols, (slice(None), slice(None, -1), slice(None)), north),
+                (-cols, (slice(None), slice(1, None), slice(None)), north))):
+            mask = np.zeros(walls.shape, dtype=bool)
+            mask[region] = values
+            degree += mask
+            flat = mask.reshape(-1)
+            self.neighbors[flat, k] = index[flat] + delta
+        self.degree = degree.reshape(n, -1)
+
+    def distances(self, sources):
+        """
+        BFS de uma célula por labirinto ao mesmo tempo
+
+        Args:
+            sources: índice (local) da origem em cada labirinto
+
+        Returns:
+            (n, células) int32 com os passos até a origem; -1 = inalcançável
+        """
+        return BatchDistances(self, sources).compute().dist
+
+    def diameter_ends(self):
+        """(starts, exits, distâncias até a saída) como DiameterLayout, para o lote inteiro"""
+        first = self.distances(np.zeros(self.count, dtype=np.int64))
+        exits = first.argmax(axis=1)
+        field = self.distances(exits)
+        starts = field.argmax(axis=1)
+        return starts, exits, field
+
+
+class BatchDistances:
+    """BFS em lote de BatchGraph.distances, retomável: uma etapa a cada report_every níveis"""
+
+    def __init__(self, graph, sources):
+        self.graph = graph
+        self.sources = sources
+        self.dist = None
+        self.ready = False
+
+    def compute_steps(self, report_every=64):
+        """Devolve a fração de células (do lote) já alcançadas"""
+        graph = self.graph
+        total = graph.count * graph.cells
+        dist = np.full(total + 1, -1, dtype=np.int32)
+        dist[total] = 0
+        # claim[i] = posição de i na última fronteira: tira repetidos sem ordenar
+        claim = np.zeros(total + 1, dtype=np.int64)
+        frontier = np.asarray(self.sources, dtype=np.int64) + np.arange(graph.count, dtype=np.int64) * graph.cells
+        dist[frontier] = 0
+        reached_count = frontier.size
+        step = 0
+        while frontier.size:
+            step += 1
+            reached = graph.neighbors[frontier].reshape(-1)
+            reached = reached[dist[reached] < 0]
+            order = np.arange(reached.size)
+            claim[reached] = order
+            reached = reached[claim[reached] == order]
+            dist[reached] = step
+            frontier = reached
+            reached_count += reached.size
+            if step % report_every == 0:
+                yield reached_count / total
+        self.dist = dist[:total].reshape(graph.count, graph.cells)
+        self.ready = True
+        yield 1.0
+
+    def compute(self):
+        for _progress in self.compute_steps():
+            pass
+        return self
+
+
+class MazeMetrics:
+    """
+    Métricas de um lote; cada atributo de METRICS é um array com um valor por labirinto
+
+    path_length: passos da entrada à saída (-1 = sem caminho)
+    dead_ends: becos (células com uma só passagem), fora entrada e saída
+    junctions: bifurcações (células com 3 ou 4 passagens)
+    branching: média de (passagens - 1) nas células que não são becos,
+        ou seja, quantas opções de caminho o jogador tem a cada passo
+    path_ratio e dead_end_ratio: os mesmos valores divididos pelas células,
+        para alvos que valem para qualquer tamanho de nível
+    """
+
+    def __init__(self, graph, starts, exits, field):
+        n = graph.count
+        degree = graph.degree
+        rows = np.arange(n)
+        self.starts = np.asarray(starts)
+        self.exits = np.asarray(exits)
+        self.path_length = field[rows, self.starts].astype(np.int64)
+
+        ends = np.zeros(degree.shape, dtype=bool)
+        ends[rows, self.starts] = True
+        ends[rows, self.exits] = True
+        self.dead_ends = ((degree == 1) & ~ends).sum(axis=1)
+        self.junctions = (degree >= 3).sum(axis=1)
+        corridors = degree >= 2
+        self.branching = np.where(corridors, degree - 1, 0).sum(axis=1) / np.maximum(corridors.sum(axis=1), 1)
+        self.path_ratio = self.path_length / graph.cells
+        self.dead_end_ratio = self.dead_ends / graph.cells
+
+    def __len__(self):
+        return len(self.path_length)
+
+    def row(self, i):
+        """Métricas do labirinto i como dict de números Python"""
+        return {name: getattr(self, name)[i].item() for name in METRICS}
+
+
+class BatchAnalysis:
+    """
+    MazeMetrics de grades do mesmo tamanho, retomável entre frames
+
+    diameter=True ignora grid.start/exit e usa as pontas do diâmetro
+    (as mesmas de DiameterLayout), devolvidas em starts/exits.
+    """
+
+    def __init__(self, grids, diameter=False):
+        self.grids = grids
+        self.diameter = diameter
+        self.metrics = None
+        self.ready = False
+
+    def compute_steps(self, report_every=64):
+        """Devolve o progresso de 0 a 1 (uma ou duas passadas de BFS em lote)"""
+        grids = self.grids
+        graph = BatchGraph(stack_walls(grids))
+        if self.diameter:
+            first = BatchDistances(graph, np.zeros(graph.count, dtype=np.int64))
+            for progress in first.compute_steps(report_every):
+                yield 0.5 * progress
+            exits = first.dist.argmax(axis=1)
+            del first
+            second = BatchDistances(graph, exits)
+            for progress in second.compute_steps(report_every):
+                yield 0.5 + 0.5 * progress
+            field = second.dist
+            starts = field.argmax(axis=1)
+        else:
+            starts = [g.start for g in grids]
+            exits = [g.exit for g in grids]
+            search = BatchDistances(graph, exits)
+            for progress in search.compute_steps(report_every):
+                yield progress
+            field = search.dist
+        self.metrics = MazeMetrics(graph, starts, exits, field)
+        self.ready = True
+        yield 1.0
+
+    def compute(self):
+        for _progress in self.compute_steps():
+            pass
+        return self
+
+
+def analyze(grids, diameter=False):
+    """MazeMetrics de grades do mesmo tamanho (BatchAnalysis de uma vez)"""
+    return BatchAnalysis(grids, diameter).compute().metrics
@@ -0,0 +1,83 @@
+"""
+Labirinto de altura ilimitada em faixas (algoritmo de Eller)
+Largura fixa, crescendo para +y: cada faixa de band_rows linhas sai do estado
+do Eller no fim da anterior. Só as faixas recentes ficam em memória; de cada
+faixa já vista fica o estado de entrada (O(cols)), então uma faixa despejada
+é refeita idêntica sem gerar de novo as de baixo.
+"""
+
+from collections import OrderedDict
+
+from .grid import MazeGrid
+from .generators import EllerGenerator
+from .endless import chunk_seed
+from .rng import MazeRandom
+
+
+class EllerBandStream:
+    """
+    Faixas de um labirinto perfeito cols x infinito, geradas sob demanda
+
+    A faixa i usa seu próprio fluxo MazeRandom (semente + i) e começa do
+    checkpoint i, então o resultado não depende da ordem dos pedidos.
+    checkpoints cresce ~5 bytes por coluna a cada faixa visitada; as
+    grades (band_rows x cols) ficam limitadas a max_bands (LRU).
+    """
+
+    def __init__(self, seed, cols, band_rows=16, max_bands=8):
+        self.seed = seed
+        self.cols = max(1, int(cols))
+        self.band_rows = max(1, int(band_rows))
+        self.max_bands = max(1, int(max_bands))
+        self.checkpoints = [EllerGenerator(self.cols).getstate()]
+        self.bands = OrderedDict()
+
+    def band(self, index):
+        """MazeGrid (band_rows x cols) da faixa index >= 0; a linha 0 da grade é a primeira da faixa"""
+        grid = self.bands.get(index)
+        if grid is not None:
+            self.bands.move_to_end(index)
+            return grid
+        # Refeita do próprio checkpoint; sem ele, a partir do último conhecido, guardando os do caminho
+        for i in range(min(index, len(self.checkpoints) - 1), index + 1):
+            grid = self._generate(i)
+        return grid
+
+    def _generate(self, index):
+        generator = EllerGenerator(self.cols, MazeRandom(chunk_seed(self.seed, 0, index)))
+        generator.setstate(self.checkpoints[index])
+        grid = MazeGrid(self.band_rows, self.cols)
+        cols = self.cols
+        for y in range(self.band_rows):
+            grid.walls[y * cols:(y + 1) * cols] = generator.next_row()
+        if index + 1 == len(self.checkpoints):
+            self.checkpoints.append(generator.getstate())
+
+        self.bands[index] = grid
+        self.bands.move_to_end(index)
+        while len(self.bands) > self.max_bands:
+            self.bands.popitem(last=False)
+        return grid
+
+    def chunk_count(self):
+        """Chunks (de band_rows colunas) na largura"""
+        return -(-self.cols // self.band_rows)
+
+    def chunk(self, cx, cy):
+        """
+        Grade do chunk (cx, cy): faixa cy, colunas cx * band_rows em diante
+
+        O último chunk fica mais estreito se cols não for múltiplo de
+        band_rows; None fora da largura ou abaixo da primeira faixa.
+        """
+        size = self.band_rows
+        if cy < 0 or not 0 <= cx < self.chunk_count():
+            return None
+        band = self.band(cy)
+        x0 = cx * size
+        width = min(size, self.cols - x0)
+        grid = MazeGrid(size, width)
+        for y in range(size):
+            row = y * self.cols + x0
+            grid.walls[y * width:(y + 1) * width] = band.walls[row:row + width]
+        return grid
@@ -0,0 +1,222 @@
+"""
+Geração de níveis em lote, fora do jogo
+Pré-monta conjuntos de níveis no cache em disco do MazeBuilder usando a mesma
+build_level_data do pré-carregamento, em um pool de processos
+
+Uso (a partir de scripts/):
+    python -m maze.batch --levels 1-50
+    python -m maze.batch --levels 1,2,3 --variants 3 --seed 7 --preview
+    python -m maze.batch --levels 1-5000 --pack ../levels.mzp
+    python -m maze.batch --levels 500-510 --pack ../giant.mzp --tile-size 256
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .grid import MazeGrid, level_seed, level_size, WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+from .generators import GENERATOR_STEPS
+from .prefetch import build_level_data, generate_level, difficulty_search
+from .snapshot import MazeSnapshot
+from .cache import DEFAULT_CACHE_DIR
+from .pack import LevelPackWriter
+from .layout import LAYOUTS, place_ends
+from .parallel import generate_tiled
+
+
+def parse_levels(spec):
+    """'1-5,8,10-12' -> [1, 2, 3, 4, 5, 8, 10, 11, 12]"""
+    levels = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            levels.extend(range(int(first), int(last) + 1))
+        else:
+            levels.append(int(part))
+    return levels
+
+
+def ascii_preview(grid, max_size=0):
+    """Desenho do labirinto em texto, com +y para cima; max_size > 0 recorta o canto inferior esquerdo"""
+    rows = min(grid.rows, max_size) if max_size else grid.rows
+    cols = min(grid.cols, max_size) if max_size else grid.cols
+    start = grid.coords(grid.start) if grid.start is not None else None
+    exit = grid.coords(grid.exit) if grid.exit is not None else None
+
+    lines = []
+    for y in range(rows - 1, -1, -1):
+        top = []
+        middle = []
+        for x in range(cols):
+            walls = grid.walls[y * grid.cols + x]
+            top.append('+---' if walls & WALL_TOP else '+   ')
+            mark = ' S ' if (x, y) == start else ' E ' if (x, y) == exit else '   '
+            middle.append(('|' if walls & WALL_LEFT else ' ') + mark)
+        last = grid.walls[y * grid.cols + cols - 1]
+        lines.append(''.join(top) + '+')
+        lines.append(''.join(middle) + ('|' if last & WALL_RIGHT else ' '))
+    bottom = ['+---' if grid.walls[x] & WALL_BOTTOM else '+   ' for x in range(cols)]
+    lines.append(''.join(bottom) + '+')
+    return '\n'.join(lines)
+
+
+def build_one(level, variant, base_seed, params, preview_size, packed=False):
+    """Roda em um processo do pool: gera (ou lê do cache) um nível e devolve um resumo
+
+    Sem pasta de cache em params só as paredes são geradas (sem malha);
+    com packed=True o resumo inclui o snapshot em bytes para o pacote.
+    """
+    seed = level_seed(base_seed, level, variant)
+    start = time.perf_counter()
+    cache_dir, generator, layout, difficulty = params[6], params[8], params[9], params[10]
+    if cache_dir:
+        data = build_level_data(level, seed, *params)
+        grid = MazeGrid(data.rows, data.cols)
+        grid.assign(data.walls, data.start, data.exit)
+        from_cache = data.from_cache
+    else:
+        grid = generate_level(level, seed, generator, layout, difficulty)
+        from_cache = False
+    elapsed = time.perf_counter() - start
+
+    preview = ascii_preview(grid, preview_size) if preview_size is not None else None
+    snapshot = MazeSnapshot.capture(grid).to_bytes() if packed else None
+    return level, variant, grid.rows, grid.cols, elapsed, from_cache, preview, snapshot
+
+
+def build_tiled(level, variant, base_seed, generator, layout, tile_size, processes, preview_size):
+    """Como build_one, mas com maze.parallel.generate_tiled (tiles em um pool próprio)
+
+    Roda no processo principal depois do pool do lote fechar: o pool dos
+    tiles não pode ficar dentro de um worker nem dividir a CPU com ele.
+    """
+    seed = level_seed(base_seed, level, variant)
+    rows, cols = level_size(level)
+    start = time.perf_counter()
+    grid = generate_tiled(rows, cols, seed, tile_size, generator, processes, open_ends=layout != 'diameter')
+    if layout == 'diameter':
+        place_ends(grid, layout)
+    elapsed = time.perf_counter() - start
+
+    preview = ascii_preview(grid, preview_size) if preview_size is not None else None
+    snapshot = MazeSnapshot.capture(grid).to_bytes()
+    return level, variant, grid.rows, grid.cols, elapsed, False, preview, snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera níveis em lote no cache do MazeBuilder")
+    parser.add_argument('--levels', default='1-10', help="ex.: 1-50 ou 1,4,9-12")
+    parser.add_argument('--variants', type=int, default=1, help="layouts por nível (variante 0 é o padrão)")
+    parser.add_argument('--seed', type=int, default=1, help="mesma semente base do args seed do MazeBuilder")
+    parser.add_argument('--generator', choices=sorted(GENERATOR_STEPS), default='backtracker')
+    parser.add_argument('--layout', choices=LAYOUTS, default='diameter', help="entrada/saída (args layout)")
+    parser.add_argument('--difficulty', default='',
+                        help="faixas de dificuldade (args difficulty), ex.: path_ratio=0.3:0.5,dead_ends=:40")
+    # Padrões iguais aos args do MazeBuilder, para as chaves do cache coincidirem
+    parser.add_argument('--cell-size', type=float, default=2.0)
+    parser.add_argument('--wall-thickness', type=float, default=0.2)
+    parser.add_argument('--wall-height', type=float, default=1.0)
+    parser.add_argument('--no-merge', action='store_true')
+    parser.add_argument('--no-cull', action='store_true')
+    parser.add_argument('--chunk-size', type=int, default=16, help="0 = malha única")
+    parser.add_argument('--cache-dir', default=None,
+                        help="pasta do cache; padrão o //maze_cache do MazeBuilder (ao lado do .range, "
+                             "na raiz do projeto), ou nenhum com --pack")
+    parser.add_argument('--pack', default=None, help="grava um pacote de níveis (LevelPack) neste arquivo")
+    parser.add_argument('--cache-max-mb', type=int, default=256,
+                        help="acima disso o cache descarta os mais antigos, como no jogo")
+    parser.add_argument('--processes', type=int, default=None, help="padrão: os.cpu_count()")
+    parser.add_argument('--tile-size', type=int, default=0,
+                        help="níveis maiores que isso são gerados em tiles paralelos (maze.parallel); "
+                             "só com --pack, 0 = desligado")
+    parser.add_argument('--preview', action='store_true', help="imprime cada labirinto em ASCII")
+    parser.add_argument('--preview-max', type=int, default=40, help="recorte máximo do preview (0 = inteiro)")
+    args = parser.parse_args(argv)
+
+    if args.difficulty:
+        if difficulty_search is None:
+            parser.error("--difficulty precisa do NumPy")
+        try:
+            args.difficulty = difficulty_search.parse_target(args.difficulty).spec()
+        except ValueError as e:
+            parser.error(str(e))
+    if args.tile_size:
+        # Tiles dão outro labirinto para a mesma semente: o cache do jogo não pode guardá-lo
+        if not args.pack or args.cache_dir:
+            parser.error("--tile-size só grava em --pack (sem --cache-dir)")
+        if args.difficulty:
+            parser.error("--tile-size não combina com --difficulty")
+    cache_dir = args.cache_dir
+    if cache_dir is None:
+        cache_dir = '' if args.pack else DEFAULT_CACHE_DIR
+    # Mesmos limites que MazeBuilder.start aplica aos args
+    params = (
+        max(0.1, args.cell_size), max(0.05, args.wall_thickness), max(0.1, args.wall_height),
+        not args.no_merge, not args.no_cull, max(0, args.chunk_size),
+        os.path.abspath(cache_dir) if cache_dir else '', max(0, args.cache_max_mb) * 1024 * 1024,
+        args.generator, args.layout, args.difficulty,
+    )
+    levels = sorted(set(parse_levels(args.levels)))
+    if not levels:
+        parser.error("nenhum nível em --levels")
+    variants = max(1, args.variants)
+    jobs = [(level, variant) for level in levels for variant in range(variants)]
+    preview_size = args.preview_max if args.preview else None
+    processes = args.processes or os.cpu_count() or 1
+    tile_size = max(0, args.tile_size)
+
+    # level_size cresce com o nível: os níveis em tiles são sempre o fim de jobs
+    split = next((i for i, (level, _variant) in enumerate(jobs)
+                  if tile_size and max(level_size(level)) > tile_size), len(jobs))
+
+    writer = None
+    if args.pack:
+        writer = LevelPackWriter(args.pack, levels[0], levels[-1] - levels[0] + 1, variants)
+    outputs = ", ".join(p for p in (params[6], args.pack) if p) or "nenhuma saída"
+    print(f"[Batch] {len(jobs)} níveis, gerador {args.generator} ({args.layout}), {processes} processos -> {outputs}")
+    start = time.perf_counter()
+    cells = 0
+    cached = 0
+    def report(result):
+        nonlocal cells, cached
+        level, variant, rows, cols, elapsed, from_cache, preview, snapshot = result
+        cells += rows * cols
+        cached += from_cache
+        if writer:
+            writer.add(level, variant, MazeSnapshot.from_bytes(snapshot))
+        note = " (cache)" if from_cache else ""
+        print(f"[Batch] Nível {level} v{variant} - {rows} x {cols} em {elapsed * 1000:.1f} ms{note}")
+        if preview:
+            print(preview)
+
+    try:
+        if split:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [pool.submit(build_one, level, variant, args.seed, params, preview_size, writer is not None)
+                           for level, variant in jobs[:split]]
+                # Resultados na ordem dos pedidos: o pacote é gravado em sequência
+                for future in futures:
+                    report(future.result())
+        # Só depois do pool fechar: cada nível em tiles usa os processos todos no pool próprio
+        for level, variant in jobs[split:]:
+            report(build_tiled(level, variant, args.seed, args.generator, args.layout,
+                               tile_size, processes, preview_size))
+    except BaseException:
+        if writer:
+            writer.abort()
+        raise
+    if writer:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"[Batch] {len(jobs)} níveis ({cached} já no cache) em {elapsed:.2f} s: "
+          f"{len(jobs) / elapsed:.1f} níveis/s, {cells / elapsed:,.0f} células/s")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
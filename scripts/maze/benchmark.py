@@ -0,0 +1,163 @@
+"""
+Benchmark dos geradores de labirinto
+Mede células por segundo e pico de memória de cada gerador registrado
+
+Uso (a partir de scripts/):
+    python -m maze.benchmark
+    python -m maze.benchmark --sizes 16 64 256 --generators kruskal wilson --repeat 5
+    python -m maze.benchmark --sizes 1000 --generators binary_tree sidewinder --mesh
+    python -m maze.benchmark --sizes 2048 --generators backtracker --tiled --processes 1 4 8
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from .grid import MazeGrid
+from .rng import MazeRandom
+from .parallel import generate_tiled
+from . import GENERATOR_STEPS
+
+
+def benchmark_generator(name, rows, cols, repeat=3, seed=1, mesh=False):
+    """Melhor tempo de repeat execuções e pico de memória de uma execução extra
+
+    O pico é medido à parte com tracemalloc, que deixa o gerador mais lento.
+    Retorna dict com name, rows, cols, seconds, cells_per_second e peak_bytes;
+    com mesh=True também mesh_seconds e triangles da malha (NumPy) do resultado.
+    """
+    steps = GENERATOR_STEPS[name]
+    best = None
+    for run in range(max(1, repeat)):
+        grid = MazeGrid(rows, cols)
+        rng = MazeRandom(seed + run)
+        start = time.perf_counter()
+        for _progress in steps(grid, rng):
+            pass
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    grid = MazeGrid(rows, cols)
+    tracemalloc.start()
+    try:
+        for _progress in steps(grid, MazeRandom(seed)):
+            pass
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    cells = rows * cols
+    result = {
+        'name': name,
+        'rows': rows,
+        'cols': cols,
+        'seconds': best,
+        'cells_per_second': cells / best if best > 0 else float('inf'),
+        'peak_bytes': peak,
+    }
+    if mesh:
+        from .mesh_arrays import build_mesh_arrays
+        start = time.perf_counter()
+        arrays = build_mesh_arrays(grid, 2.0, 0.2, 1.0)
+        result['mesh_seconds'] = time.perf_counter() - start
+        result['triangles'] = arrays.triangle_count
+    return result
+
+
+def benchmark_tiled(name, rows, cols, tile_size=256, processes=None, repeat=3, seed=1):
+    """Como benchmark_generator, mas com maze.parallel.generate_tiled
+
+    O pico de memória é só o do processo principal (os workers não entram).
+    """
+    best = None
+    for run in range(max(1, repeat)):
+        start = time.perf_counter()
+        generate_tiled(rows, cols, seed + run, tile_size, name, processes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        generate_tiled(rows, cols, seed, tile_size, name, processes)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    label = f"{name}/{processes or 'cpu'}p"
+    return {
+        'name': label,
+        'rows': rows,
+        'cols': cols,
+        'seconds': best,
+        'cells_per_second': rows * cols / best if best > 0 else float('inf'),
+        'peak_bytes': peak,
+    }
+
+
+def run_benchmarks(sizes, names=None, repeat=3, seed=1, mesh=False):
+    """Resultados de benchmark_generator para cada tamanho (lado) e gerador"""
+    names = list(names or GENERATOR_STEPS)
+    return [benchmark_generator(name, size, size, repeat, seed, mesh) for size in sizes for name in names]
+
+
+def fastest_by_size(results, max_peak_bytes=0):
+    """{(rows, cols): nome} do gerador mais rápido que cabe em max_peak_bytes (0 = sem limite)"""
+    best = {}
+    for r in results:
+        if max_peak_bytes and r['peak_bytes'] > max_peak_bytes:
+            continue
+        key = (r['rows'], r['cols'])
+        if key not in best or r['cells_per_second'] > best[key]['cells_per_second']:
+            best[key] = r
+    return {key: r['name'] for key, r in best.items()}
+
+
+def format_results(results):
+    mesh = any('mesh_seconds' in r for r in results)
+    header = f"{'gerador':<14} {'tamanho':>11} {'ms':>10} {'células/s':>12} {'pico KiB':>10}"
+    if mesh:
+        header += f" {'malha ms':>10} {'triângulos':>12}"
+    lines = [header]
+    for r in results:
+        size = f"{r['rows']}x{r['cols']}"
+        line = (f"{r['name']:<14} {size:>11} {r['seconds'] * 1000:>10.2f} "
+                f"{r['cells_per_second']:>12,.0f} {r['peak_bytes'] / 1024:>10.1f}")
+        if mesh:
+            line += f" {r['mesh_seconds'] * 1000:>10.2f} {r['triangles']:>12,}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos geradores de labirinto")
+    # Padrão: tamanhos dos níveis 1, 10 e 50 (level_size)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 26, 106])
+    parser.add_argument('--generators', nargs='+', choices=sorted(GENERATOR_STEPS), default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-peak-kib', type=int, default=0,
+                        help="só sugere geradores com pico de memória abaixo disso")
+    parser.add_argument('--mesh', action='store_true',
+                        help="também mede a montagem da malha (NumPy) do labirinto gerado")
+    parser.add_argument('--tiled', action='store_true',
+                        help="gera em tiles paralelos (maze.parallel) para cada valor de --processes")
+    parser.add_argument('--tile-size', type=int, default=256)
+    parser.add_argument('--processes', type=int, nargs='+', default=[None],
+                        help="processos do pool com --tiled (padrão: os.cpu_count())")
+    args = parser.parse_args(argv)
+
+    if args.tiled:
+        names = args.generators or ['backtracker']
+        results = [benchmark_tiled(name, size, size, args.tile_size, processes, args.repeat, args.seed)
+                   for size in args.sizes for name in names for processes in args.processes]
+    else:
+        results = run_benchmarks(args.sizes, args.generators, args.repeat, args.seed, args.mesh)
+    print(format_results(results))
+    print()
+    for (rows, cols), name in fastest_by_size(results, args.max_peak_kib * 1024).items():
+        print(f"[Benchmark] {rows}x{cols}: mais rápido = {name}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Cache em disco de labirintos prontos
+Guarda paredes empacotadas + buffers da malha, carregados com mmap (sem cópia)
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+from .snapshot import MazeSnapshot
+
+try:
+    import numpy as np
+    from .mesh_arrays import MeshArrays
+except ImportError:
+    np = None
+
+# 2: labirintos gerados com MazeRandom (PCG32) em vez de random.Random
+FORMAT_VERSION = 2
+MAGIC = b'MZC1'
+
+# magic, versão, flags, tamanho do snapshot, quantidade de malhas
+_HEADER = struct.Struct('<4sIIII')
+# cx, cy, vértices, triângulos
+_MESH_ENTRY = struct.Struct('<iiII')
+FLAG_CHUNKED = 1
+_ALIGN = 16
+
+# Mesma pasta que o //maze_cache do MazeBuilder: ao lado do .range, na raiz do projeto (acima de scripts/)
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'maze_cache')
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def cache_key(seed, rows, cols, cell_size, wall_thickness, wall_height, *mesh_params):
+    """Chave estável de uma entrada; mesh_params = modo da malha (merge, cull, chunk_size...)"""
+    parts = [FORMAT_VERSION, int(seed), int(rows), int(cols),
+             repr(float(cell_size)), repr(float(wall_thickness)), repr(float(wall_height))]
+    parts.extend(repr(p) for p in mesh_params)
+    data = ':'.join(str(p) for p in parts).encode()
+    return hashlib.sha1(data).hexdigest()
+
+
+class CachedLevel:
+    """Entrada carregada: snapshot + malhas (views do mmap, somente leitura)"""
+
+    __slots__ = ('snapshot', 'meshes', '_mmap')
+
+    def __init__(self, snapshot, meshes, _mmap=None):
+        self.snapshot = snapshot
+        self.meshes = meshes
+        self._mmap = _mmap
+
+
+class MazeCache:
+    """
+    Cache LRU em disco, limitado a max_bytes
+
+    O horário de modificação de cada arquivo marca o último uso; ao gravar,
+    as entradas mais antigas são removidas até caber no limite.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.maze')
+
+    def load(self, key):
+        """Retorna CachedLevel ou None (entrada ausente ou inválida)"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            level = self._parse(mm)
+        except (struct.error, ValueError):
+            mm.close()
+            return None
+
+        # Marca como usado recentemente (LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return level
+
+    def _parse(self, mm):
+        magic, version, flags, snap_size, n_meshes = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Cache em formato desconhecido")
+        offset = _HEADER.size
+        snapshot = MazeSnapshot.from_bytes(mm[offset:offset + snap_size])
+        offset += snap_size
+
+        entries = []
+        for _i in range(n_meshes):
+            entries.append(_MESH_ENTRY.unpack_from(mm, offset))
+            offset += _MESH_ENTRY.size
+
+        meshes = None
+        if n_meshes and np is not None:
+            meshes = {}
+            for cx, cy, n_vertices, n_tris in entries:
+                offset = _aligned(offset)
+                positions = np.frombuffer(mm, np.float32, n_vertices * 3, offset).reshape(-1, 3)
+                offset += positions.nbytes
+                normals = np.frombuffer(mm, np.float32, n_vertices * 3, offset).reshape(-1, 3)
+                offset += normals.nbytes
+                indices = np.frombuffer(mm, np.uint32, n_tris * 3, offset).reshape(-1, 3)
+                offset += indices.nbytes
+                meshes[(cx, cy)] = MeshArrays(positions, normals, indices)
+            if not flags & FLAG_CHUNKED:
+                meshes = meshes[(0, 0)]
+        return CachedLevel(snapshot, meshes, mm)
+
+    def store(self, key, snapshot, meshes=None):
+        """Grava (de forma atômica) o snapshot e as malhas (MeshArrays ou dict por chunk)"""
+        flags = 0
+        if isinstance(meshes, dict):
+            flags |= FLAG_CHUNKED
+            items = sorted(meshes.items())
+        elif meshes is not None:
+            items = [((0, 0), meshes)]
+        else:
+            items = []
+
+        snap = snapshot.to_bytes()
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(snap), len(items)), snap]
+        for (cx, cy), arrays in items:
+            parts.append(_MESH_ENTRY.pack(cx, cy, len(arrays.positions), len(arrays.indices)))
+
+        offset = sum(len(p) for p in parts)
+        for _key, arrays in items:
+            pad = _aligned(offset) - offset
+            parts.append(b'\0' * pad)
+            offset += pad
+            for array, dtype in ((arrays.positions, np.float32), (arrays.normals, np.float32),
+                                 (arrays.indices, np.uint32)):
+                data = np.ascontiguousarray(array, dtype=dtype).tobytes()
+                parts.append(data)
+                offset += len(data)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.writelines(parts)
+            os.replace(tmp_path, self.path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até caber em max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith('.maze'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,155 @@
+"""
+Geração com dificuldade-alvo (NumPy)
+Gera candidatos em lotes, mede todos de uma vez com maze.analytics e fica
+com o primeiro que cai na faixa pedida (amostragem por rejeição)
+"""
+
+import numpy as np
+
+from .grid import MazeGrid
+from .generators import GENERATOR_STEPS, open_entrance_and_exit
+from .rng import MazeRandom
+from .analytics import METRICS, BatchAnalysis
+
+# Candidatos além do primeiro usam fluxos a partir daqui (0 é o do nível, 1 o dos checkpoints)
+CANDIDATE_STREAM = 1 << 32
+
+
+class DifficultyTarget:
+    """
+    Faixas aceitas por métrica: {'path_ratio': (0.3, 0.5), 'dead_ends': (None, 40)}
+
+    None em um lado da faixa deixa esse lado aberto.
+    """
+
+    def __init__(self, bands):
+        for name in bands:
+            if name not in METRICS:
+                raise ValueError(f"Métrica desconhecida '{name}' ({', '.join(METRICS)})")
+        self.bands = dict(bands)
+
+    def __bool__(self):
+        return bool(self.bands)
+
+    def spec(self):
+        """Texto canônico (ordenado) das faixas: o mesmo alvo dá a mesma chave de cache"""
+        def bound(value):
+            return '' if value is None else repr(value)
+        return ','.join(f"{name}={bound(low)}:{bound(high)}" for name, (low, high) in sorted(self.bands.items()))
+
+    def accepts(self, metrics):
+        """Array bool: quais labirintos do lote estão dentro de todas as faixas"""
+        ok = np.ones(len(metrics), dtype=bool)
+        for name, (low, high) in self.bands.items():
+            values = getattr(metrics, name)
+            if low is not None:
+                ok &= values >= low
+            if high is not None:
+                ok &= values <= high
+        return ok
+
+    def miss(self, metrics):
+        """Quanto cada labirinto fica fora das faixas (relativo à faixa); 0 = aceito"""
+        total = np.zeros(len(metrics))
+        for name, (low, high) in self.bands.items():
+            values = getattr(metrics, name).astype(np.float64)
+            scale = max(abs(high if high is not None else low or 1.0), 1e-9)
+            if low is not None:
+                total += np.maximum(low - values, 0) / scale
+            if high is not None:
+                total += np.maximum(values - high, 0) / scale
+        return total
+
+
+def parse_target(spec):
+    """'path_ratio=0.3:0.5, dead_ends=:40' -> DifficultyTarget (texto vazio = sem alvo)"""
+    bands = {}
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, band = part.partition('=')
+        low, sep, high = band.partition(':')
+        if not sep:
+            raise ValueError(f"Faixa inválida em '{part}' (use nome=min:max)")
+        bands[name.strip()] = (float(low) if low.strip() else None,
+                               float(high) if high.strip() else None)
+    return DifficultyTarget(bands)
+
+
+class DifficultySearch:
+    """
+    Procura um labirinto rows x cols dentro do alvo, por rejeição
+
+    O candidato 0 usa MazeRandom(seed), o mesmo labirinto da geração normal;
+    os seguintes usam outros fluxos da mesma semente, então o resultado é
+    determinístico. Sem nenhum aceito em max_candidates, fica o mais próximo
+    do alvo. Ao terminar, grid recebe paredes, entrada e saída do escolhido.
+    """
+
+    def __init__(self, grid, seed, target, generator='backtracker', layout='diameter',
+                 batch_size=4, max_candidates=32):
+        self.grid = grid
+        self.seed = seed
+        self.target = target
+        self.generator = generator
+        self.layout = layout
+        self.batch_size = max(1, int(batch_size))
+        self.max_candidates = max(1, int(max_candidates))
+        self.candidates = 0
+        self.accepted = False
+        self.metrics = None
+        self.ready = False
+
+    def candidate_rng(self, i):
+        return MazeRandom(self.seed) if i == 0 else MazeRandom(self.seed, CANDIDATE_STREAM + i)
+
+    def compute_steps(self):
+        """Retomável: repassa as etapas do gerador de cada candidato; cada lote completo é medido de uma vez"""
+        grid = self.grid
+        steps = GENERATOR_STEPS[self.generator]
+        diameter = self.layout == 'diameter'
+        best = None
+        best_miss = None
+        batch = []
+        for i in range(self.max_candidates):
+            candidate = MazeGrid(grid.rows, grid.cols)
+            rng = self.candidate_rng(i)
+            for progress in steps(candidate, rng, open_ends=False):
+                yield (i + progress) / self.max_candidates
+            if not diameter:
+                open_entrance_and_exit(candidate, rng)
+            batch.append(candidate)
+            self.candidates = i + 1
+            yield self.candidates / self.max_candidates
+            if len(batch) < self.batch_size and i + 1 < self.max_candidates:
+                continue
+
+            # A medição do lote também é fatiada (BFS em lote pode levar dezenas de ms)
+            analysis = BatchAnalysis(batch, diameter)
+            for _progress in analysis.compute_steps():
+                yield self.candidates / self.max_candidates
+            metrics = analysis.metrics
+            accepted = np.flatnonzero(self.target.accepts(metrics))
+            if accepted.size:
+                best, best_metrics = accepted[0], metrics
+                best_grid = batch[best]
+                self.accepted = True
+                break
+            miss = self.target.miss(metrics)
+            k = int(miss.argmin())
+            if best_miss is None or miss[k] < best_miss:
+                best_miss = miss[k]
+                best, best_metrics, best_grid = k, metrics, batch[k]
+            batch = []
+
+        start, exit = int(best_metrics.starts[best]), int(best_metrics.exits[best])
+        grid.assign(best_grid.walls, start, exit)
+        self.metrics = best_metrics.row(best)
+        self.ready = True
+        yield 1.0
+
+    def compute(self):
+        for _progress in self.compute_steps():
+            pass
+        return self
@@ -0,0 +1,160 @@
+"""
+Modo infinito
+O mundo é uma grade ilimitada de chunks; cada chunk é um labirinto perfeito
+gerado só a partir da semente e das suas coordenadas, ligado aos vizinhos
+por uma porta em cada borda. Assim um chunk despejado pode ser refeito
+idêntico a qualquer momento, em qualquer ordem.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+from .grid import MazeGrid, WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+from .generators import GENERATOR_STEPS
+from .rng import MazeRandom
+
+# Eixo da borda compartilhada: entre (cx, cy) e (cx, cy + 1) ou entre (cx, cy) e (cx + 1, cy)
+EDGE_HORIZONTAL = 'h'
+EDGE_VERTICAL = 'v'
+
+
+def _hash64(*parts):
+    data = ":".join(str(p) for p in parts).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def chunk_seed(world_seed, cx, cy):
+    """Semente determinística do interior do chunk (cx, cy)"""
+    return _hash64(world_seed, cx, cy)
+
+
+def door_offset(world_seed, cx, cy, edge, size):
+    """Célula (0 a size - 1) da porta na borda superior/direita do chunk (cx, cy)
+
+    Os dois chunks da borda calculam a mesma porta sem precisar um do outro.
+    """
+    return _hash64(world_seed, cx, cy, edge) % size
+
+
+def world_chunk(x, y, size):
+    """Chunk que contém a célula global (x, y), inclusive negativa"""
+    return x // size, y // size
+
+
+def start_cell(size):
+    """Célula global de partida: centro do chunk (0, 0)"""
+    return size // 2, size // 2
+
+
+def generate_chunk(world_seed, cx, cy, size, generator='backtracker'):
+    """Grade size x size do chunk (cx, cy), com as quatro portas abertas"""
+    grid = MazeGrid(size, size)
+    rng = MazeRandom(chunk_seed(world_seed, cx, cy))
+    for _progress in GENERATOR_STEPS[generator](grid, rng, open_ends=False):
+        pass
+
+    walls = grid.walls
+    top = (size - 1) * size
+    walls[door_offset(world_seed, cx, cy - 1, EDGE_HORIZONTAL, size)] &= ~WALL_BOTTOM
+    walls[top + door_offset(world_seed, cx, cy, EDGE_HORIZONTAL, size)] &= ~WALL_TOP
+    walls[door_offset(world_seed, cx - 1, cy, EDGE_VERTICAL, size) * size] &= ~WALL_LEFT
+    walls[door_offset(world_seed, cx, cy, EDGE_VERTICAL, size) * size + size - 1] &= ~WALL_RIGHT
+    return grid
+
+
+def owned_walls(grid, right=True):
+    """Cópia da grade sem as bordas superior e direita, que pertencem aos vizinhos
+
+    Evita que a parede compartilhada entre dois chunks seja desenhada duas vezes.
+    right=False mantém a borda direita (chunk sem vizinho desse lado).
+    """
+    owned = MazeGrid(grid.rows, grid.cols)
+    walls = owned.walls
+    walls[:] = grid.walls
+    cols = grid.cols
+    for i in range((grid.rows - 1) * cols, len(walls)):
+        walls[i] &= ~WALL_TOP
+    if right:
+        for i in range(cols - 1, len(walls), cols):
+            walls[i] &= ~WALL_RIGHT
+    return owned
+
+
+class ChunkStreamer:
+    """
+    Chunks carregados ao redor de um ponto, com despejo LRU
+
+    Não conhece a engine: guarda um valor qualquer por chunk e quantos
+    bytes ele ocupa. O orçamento (max_chunks / max_bytes) nunca despeja
+    a vizinhança pedida, então max_chunks é no mínimo (2 * radius + 1)².
+    """
+
+    def __init__(self, radius=2, max_chunks=0, max_bytes=0):
+        self.radius = max(0, int(radius))
+        ring = (2 * self.radius + 1) ** 2
+        self.max_chunks = max(ring, int(max_chunks)) if max_chunks else 2 * ring
+        self.max_bytes = max(0, int(max_bytes))
+        self.loaded = OrderedDict()
+        self.sizes = {}
+        self.bytes_used = 0
+
+    def __len__(self):
+        return len(self.loaded)
+
+    def __contains__(self, key):
+        return key in self.loaded
+
+    def get(self, key):
+        return self.loaded.get(key)
+
+    def wanted(self, center):
+        """Chunks a até radius de center, do mais próximo ao mais distante"""
+        cx, cy = center
+        r = self.radius
+        keys = [(cx + dx, cy + dy) for dy in range(-r, r + 1) for dx in range(-r, r + 1)]
+        keys.sort(key=lambda k: max(abs(k[0] - cx), abs(k[1] - cy)))
+        return keys
+
+    def touch(self, keys):
+        """Marca os chunks como usados agora (o último fica como o mais recente)"""
+        for key in keys:
+            if key in self.loaded:
+                self.loaded.move_to_end(key)
+
+    def add(self, key, value, nbytes=0):
+        self.pop(key)
+        self.loaded[key] = value
+        self.sizes[key] = nbytes
+        self.bytes_used += nbytes
+
+    def pop(self, key):
+        if key not in self.loaded:
+            return None
+        self.bytes_used -= self.sizes.pop(key)
+        return self.loaded.pop(key)
+
+    def over_budget(self, reserve=0):
+        if len(self.loaded) + reserve > self.max_chunks:
+            return True
+        return bool(self.max_bytes) and self.bytes_used > self.max_bytes
+
+    def evict(self, keep=(), reserve=0):
+        """Despeja os menos usados fora de keep até caber no orçamento
+
+        reserve abre espaço para chunks que ainda vão ser adicionados.
+        Retorna [(chave, valor)] dos despejados.
+        """
+        evicted = []
+        for key in list(self.loaded):
+            if not self.over_budget(reserve):
+                break
+            if key not in keep:
+                evicted.append((key, self.pop(key)))
+        return evicted
+
+    def clear(self):
+        evicted = list(self.loaded.items())
+        self.loaded.clear()
+        self.sizes.clear()
+        self.bytes_used = 0
+        return evicted
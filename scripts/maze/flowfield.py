@@ -0,0 +1,156 @@
+"""
+Campo de fluxo compartilhado por muitos agentes
+Um único BFS (DistanceField) até o alvo, tipicamente a célula do jogador, diz
+a cada célula para onde andar; cada agente só lê a direção da sua célula, em
+O(1), então o custo de pathfinding não depende de quantos agentes existem.
+O campo só é refeito quando o alvo muda de célula.
+"""
+
+from collections import OrderedDict
+
+from .graph import open_moves, passage_count
+from .solver import DistanceField, NO_STEP
+
+
+class FlowFieldService:
+    """
+    Campo de fluxo até um alvo móvel, refeito só quando o alvo troca de célula
+
+    O BFS do alvo novo é retomável (compute_steps() dentro do orçamento do
+    frame) e, enquanto não termina, os agentes seguem o campo anterior. Um BFS
+    em andamento não é descartado: ao terminar, o próximo começa já com o alvo
+    mais recente, então o campo se atualiza mesmo com o alvo sempre andando.
+    Em labirintos perfeitos (árvore) as direções são corrigidas na hora, pois
+    só as células do caminho entre o alvo antigo e o novo mudam de sentido;
+    as distâncias ficam defasadas (exact é False) até o BFS terminar.
+    Os últimos max_fields campos completos ficam guardados (LRU), para o alvo
+    que volta a uma célula recente.
+    """
+
+    def __init__(self, grid, max_fields=4):
+        self.grid = grid
+        self.max_fields = max(1, int(max_fields))
+        self._back = grid.back_directions
+        # Árvore: uma passagem a menos que células (a conexidade é conferida no primeiro BFS)
+        self.tree = passage_count(open_moves(grid)) == len(grid.walls) - 1
+        self.fields = OrderedDict()
+        self.field = None
+        self.exact = False
+        self.target = None
+        self.pending = None
+        self._job = None
+        self.recomputes = 0
+
+    @property
+    def ready(self):
+        return self.field is not None
+
+    @property
+    def busy(self):
+        return self._job is not None
+
+    def set_target(self, cell):
+        """Troca o alvo; nada acontece se a célula não mudou"""
+        if cell is None or not 0 <= cell < len(self.grid.walls) or cell == self.target:
+            return
+        self.target = cell
+        cached = self.fields.get(cell)
+        if cached is not None:
+            self.fields.move_to_end(cell)
+            self.field = cached
+            self.exact = True
+            return
+        if self.tree and self.field is not None and self._retarget(cell):
+            self.exact = False
+        if self._job is None:
+            self._start(cell)
+
+    def _start(self, cell):
+        self.pending = DistanceField(self.grid, cell)
+        self._job = self.pending.compute_steps()
+
+    def _retarget(self, cell):
+        """Inverte as direções do caminho de cell até o alvo do campo atual; False se inalcançável"""
+        field = self.field
+        toward = field.toward
+        if toward[cell] == NO_STEP and cell != field.target:
+            return False
+        # O campo vai mudar: deixa de valer para o alvo antigo guardado no LRU
+        if self.fields.get(field.target) is field:
+            del self.fields[field.target]
+        offsets = self.grid.neighbor_offsets
+        back = self._back
+        previous = NO_STEP
+        current = cell
+        while current != field.target:
+            k = toward[current]
+            toward[current] = previous
+            previous = back[k]
+            current += offsets[k][2]
+        toward[current] = previous
+        field.target = cell
+        return True
+
+    def compute_steps(self):
+        """Avança o BFS pendente (retomável); cada campo completo passa a valer ao terminar"""
+        while self._job is not None:
+            for progress in self._job:
+                yield progress
+            self._finish()
+
+    def compute(self):
+        for _progress in self.compute_steps():
+            pass
+        return self
+
+    def _finish(self):
+        field = self.pending
+        self.pending = None
+        self._job = None
+        self.recomputes += 1
+        if self.tree and min(field.dist) < 0:
+            self.tree = False
+        self.fields[field.target] = field
+        while len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+
+        if field.target == self.target:
+            self.field = field
+            self.exact = True
+            return
+        # O alvo andou durante o BFS; numa árvore o campo atual já foi corrigido para ele
+        if self.field is None or not self.tree:
+            self.field = field
+            self.exact = False
+            if self.tree:
+                self._retarget(self.target)
+        self._start(self.target)
+
+    def next_step(self, cell):
+        """Célula vizinha um passo mais perto do alvo, ou None (O(1))"""
+        return self.field.next_step(cell) if self.field else None
+
+    def direction(self, cell):
+        """(dx, dy) de um passo rumo ao alvo, ou None (O(1))"""
+        if not self.field or cell is None or not 0 <= cell < len(self.grid.walls):
+            return None
+        k = self.field.toward[cell]
+        if k == NO_STEP:
+            return None
+        dx, dy, _delta, _wall, _opposite = self.grid.neighbor_offsets[k]
+        return dx, dy
+
+    def distance(self, cell):
+        """Passos até o alvo; -1 se inalcançável ou sem campo (pode estar defasada se exact for False)"""
+        return self.field.distance(cell) if self.field else -1
+
+    def invalidate(self):
+        """Paredes mudaram: descarta os campos e refaz o BFS do alvo atual"""
+        self.tree = passage_count(open_moves(self.grid)) == len(self.grid.walls) - 1
+        self.fields.clear()
+        self.field = None
+        self.exact = False
+        self.pending = None
+        self._job = None
+        target, self.target = self.target, None
+        self.set_target(target)
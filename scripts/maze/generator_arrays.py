@@ -0,0 +1,98 @@
+"""
+Geradores vetorizados (NumPy)
+Binary tree e sidewinder sobre a grade inteira de uma vez, para labirintos
+de milhões de células (testes de carga da malha, física e UI)
+"""
+
+import numpy as np
+
+from .grid import WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+from .generators import open_entrance_and_exit
+from .mesh_arrays import wall_array
+from .rng import MazeRandom, ensure_rng
+
+
+def numpy_rng(rng):
+    """Fonte em lote para os geradores: o próprio MazeRandom, ou um gerador NumPy derivado do rng"""
+    if isinstance(rng, MazeRandom):
+        return rng
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def coin_flips(np_rng, shape):
+    """Booleanos com 50% de chance, a partir de bytes aleatórios (mais barato que floats)"""
+    count = int(np.prod(shape))
+    return np.frombuffer(np_rng.bytes(count), dtype=np.uint8).reshape(shape) < 128
+
+
+def carve(walls, north, east):
+    """Abre as passagens marcadas: north (célula -> y + 1) e east (célula -> x + 1)"""
+    # Máscaras como bits (sem indexação booleana, que é bem mais lenta)
+    up = north.view(np.uint8)
+    right = east.view(np.uint8)
+    opened = up * np.uint8(WALL_TOP) | right * np.uint8(WALL_RIGHT)
+    opened[1:] |= up[:-1] * np.uint8(WALL_BOTTOM)
+    opened[:, 1:] |= right[:, :-1] * np.uint8(WALL_LEFT)
+    walls &= ~opened
+
+
+def binary_tree_arrays(rows, cols, np_rng):
+    """Máscaras (north, east) do binary tree: cada célula abre para cima ou para a direita"""
+    north = coin_flips(np_rng, (rows, cols))
+    # Última linha só anda para a direita; última coluna só para cima
+    north[-1, :] = False
+    north[:, -1] = True
+    north[-1, -1] = False
+    east = ~north
+    east[:, -1] = False
+    return north, east
+
+
+def sidewinder_arrays(rows, cols, np_rng):
+    """Máscaras (north, east) do sidewinder
+
+    Cada linha é cortada em sequências horizontais; cada sequência abre para
+    cima por uma célula sorteada dentro dela. A última linha é um corredor só.
+    """
+    close = coin_flips(np_rng, (rows, cols))
+    close[:, -1] = True
+    close[-1, :] = False
+    east = ~close
+    east[:, -1] = False
+
+    # Início da sequência de cada célula: a coluna seguinte a um fechamento
+    starts = np.zeros((rows, cols), dtype=np.int32)
+    np.multiply(close[:, :-1], np.arange(1, cols, dtype=np.int32), out=starts[:, 1:])
+    starts = np.maximum.accumulate(starts, axis=1)
+
+    flat_close = np.flatnonzero(close)
+    x_close = flat_close % cols
+    run_start = starts.ravel()[flat_close]
+    length = x_close - run_start + 1
+    offset = (np_rng.random(len(flat_close), dtype=np.float32) * length).astype(np.int64)
+    pick = flat_close - x_close + run_start + np.minimum(offset, length - 1)
+
+    north = np.zeros((rows, cols), dtype=bool)
+    north.ravel()[pick] = True
+    return north, east
+
+
+def _array_steps(fill, grid, rng, open_ends):
+    rng = ensure_rng(rng)
+    walls = wall_array(grid)
+    north, east = fill(grid.rows, grid.cols, numpy_rng(rng))
+    yield 0.5
+    carve(walls, north, east)
+    if open_ends:
+        open_entrance_and_exit(grid, rng)
+    yield 1.0
+
+
+def binary_tree_steps(grid, rng=None, report_every=0, open_ends=True):
+    """Binary tree vetorizado; mesma assinatura retomável dos outros geradores"""
+    return _array_steps(binary_tree_arrays, grid, rng, open_ends)
+
+
+def sidewinder_steps(grid, rng=None, report_every=0, open_ends=True):
+    """Sidewinder vetorizado; mesma assinatura retomável dos outros geradores"""
+    return _array_steps(sidewinder_arrays, grid, rng, open_ends)
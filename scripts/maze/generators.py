@@ -0,0 +1,420 @@
+"""
+Geradores de labirinto sobre a grade plana (MazeGrid)
+"""
+
+from array import array
+
+from .grid import WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT, WALL_ALL, VISITED
+from .rng import ensure_rng
+
+
+def open_entrance_and_exit(grid, rng=None):
+    """Escolhe entrada na primeira linha e saída na última e abre as paredes"""
+    rng = ensure_rng(rng)
+    cols, rows = grid.cols, grid.rows
+    grid.start = grid.index(rng.randint(0, cols - 1), 0)
+    grid.exit = grid.index(rng.randint(0, cols - 1), rows - 1)
+
+    grid.walls[grid.start] &= ~(WALL_TOP | WALL_BOTTOM)
+    grid.walls[grid.exit] &= ~(WALL_TOP | WALL_BOTTOM)
+
+
+def backtracker_steps(grid, rng=None, report_every=256, open_ends=True):
+    """Backtracker recursivo retomável: gera o labirinto aos poucos
+
+    A cada report_every células visitadas devolve (yield) a fração já
+    visitada, para quem chama poder parar e continuar no próximo frame.
+    open_ends=False não abre entrada/saída (ex.: chunks do modo infinito).
+    """
+    rng = ensure_rng(rng)
+    walls = grid.walls
+    cols, rows = grid.cols, grid.rows
+    last_col, last_row = cols - 1, rows - 1
+    # Vizinhos desenrolados na ordem de neighbor_offsets (outra ordem daria outros labirintos)
+    left, right, down, up = [(delta, wall, opposite)
+                             for _dx, _dy, delta, wall, opposite in grid.neighbor_offsets]
+    total = len(walls)
+    choice = rng.choice
+
+    walls[0] |= VISITED
+    stack = [0]
+    push = stack.append
+    choices = []
+    add = choices.append
+    visited = 1
+    while stack:
+        current = stack[-1]
+        y, x = divmod(current, cols)
+        choices.clear()
+        if x and not walls[current - 1] & VISITED:
+            add(left)
+        if x < last_col and not walls[current + 1] & VISITED:
+            add(right)
+        if y and not walls[current - cols] & VISITED:
+            add(down)
+        if y < last_row and not walls[current + cols] & VISITED:
+            add(up)
+        if choices:
+            delta, wall, opposite = choice(choices)
+            neighbor = current + delta
+            walls[current] &= ~wall
+            walls[neighbor] = (walls[neighbor] & ~opposite) | VISITED
+            push(neighbor)
+            visited += 1
+            if visited % report_every == 0:
+                yield visited / total
+        else:
+            stack.pop()
+
+    grid.clear_visited()
+    if open_ends:
+        open_entrance_and_exit(grid, rng)
+    yield 1.0
+
+
+def generate_backtracker(grid, rng=None):
+    """Backtracker recursivo (iterativo, sobre índices) partindo da célula 0"""
+    for _progress in backtracker_steps(grid, rng):
+        pass
+    return grid
+
+
+class EllerGenerator:
+    """
+    Algoritmo de Eller: produz o labirinto linha a linha com memória O(cols)
+
+    Só guarda o conjunto (componente conexa) de cada coluna da linha atual
+    e quais células abrem para a próxima linha. Com rows=None a sequência
+    de linhas é infinita; com rows definido a última linha une tudo e o
+    labirinto resultante é perfeito.
+
+    getstate()/setstate() guardam e restauram o estado entre duas linhas
+    (O(cols)); maze.bands usa isso para refazer faixas despejadas.
+    """
+
+    def __init__(self, cols, rng=None, rows=None):
+        self.cols = cols
+        self.rows = rows
+        self.rng = ensure_rng(rng)
+        self.y = 0
+        self.sets = list(range(cols))
+        self.next_set = cols
+        self.open_below = bytearray(cols)
+
+    def getstate(self):
+        """(conjuntos renumerados por ordem de aparição, células que descem); não inclui o rng"""
+        labels = {}
+        sets = array('I', [labels.setdefault(label, len(labels)) for label in self.sets])
+        return sets, bytes(self.open_below)
+
+    def setstate(self, state):
+        sets, open_below = state
+        self.sets = list(sets)
+        self.open_below = bytearray(open_below)
+        # Rótulos renumerados ficam abaixo de cols: os novos não colidem
+        self.next_set = self.cols
+
+    def next_row(self):
+        """Máscaras de parede (bytearray de cols) da próxima linha, ou None no fim"""
+        if self.rows is not None and self.y >= self.rows:
+            return None
+
+        cols = self.cols
+        rng = self.rng
+        sets = self.sets
+        last = self.rows is not None and self.y == self.rows - 1
+
+        row = bytearray([WALL_ALL]) * cols
+        for x in range(cols):
+            if self.open_below[x]:
+                row[x] &= ~WALL_BOTTOM
+
+        members = {}
+        for x in range(cols):
+            members.setdefault(sets[x], []).append(x)
+
+        # Uniões horizontais entre conjuntos diferentes (todas na última linha);
+        # o conjunto menor é renomeado para o maior
+        for x in range(cols - 1):
+            a, b = sets[x], sets[x + 1]
+            if a != b and (last or rng.random() < 0.5):
+                row[x] &= ~WALL_RIGHT
+                row[x + 1] &= ~WALL_LEFT
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for i in members[b]:
+                    sets[i] = a
+                members[a].extend(members.pop(b))
+
+        self.y += 1
+        if last:
+            return row
+
+        # Cada conjunto desce por pelo menos uma célula; as outras ganham conjunto novo
+        open_below = bytearray(cols)
+        for cells in members.values():
+            down = [x for x in cells if rng.random() < 0.5]
+            if not down:
+                down = [rng.choice(cells)]
+            for x in down:
+                open_below[x] = 1
+                row[x] &= ~WALL_TOP
+
+        for x in range(cols):
+            if not open_below[x]:
+                sets[x] = self.next_set
+                self.next_set += 1
+        self.open_below = open_below
+        return row
+
+    def __iter__(self):
+        while True:
+            row = self.next_row()
+            if row is None:
+                return
+            yield row
+
+
+def eller_steps(grid, rng=None, report_every=16, open_ends=True):
+    """Preenche a grade com o algoritmo de Eller, devolvendo o progresso por linhas
+
+    Para altura ilimitada sem a grade inteira em memória, veja maze.bands.
+    """
+    rng = ensure_rng(rng)
+    cols = grid.cols
+    generator = EllerGenerator(cols, rng, grid.rows)
+    for y, row in enumerate(generator):
+        grid.walls[y * cols:(y + 1) * cols] = row
+        if (y + 1) % report_every == 0:
+            yield (y + 1) / grid.rows
+
+    if open_ends:
+        open_entrance_and_exit(grid, rng)
+    yield 1.0
+
+
+def generate_eller(grid, rng=None):
+    for _progress in eller_steps(grid, rng):
+        pass
+    return grid
+
+
+def kruskal_steps(grid, rng=None, report_every=4096, open_ends=True):
+    """Kruskal: derruba paredes em ordem aleatória unindo componentes (union-find)
+
+    Cada aresta é o índice da célula * 2 + (0 = direita, 1 = cima).
+    """
+    rng = ensure_rng(rng)
+    walls = grid.walls
+    cols = grid.cols
+    edges = [i * 2 for i in range(len(walls)) if i % cols < cols - 1]
+    edges.extend(i * 2 + 1 for i in range(len(walls) - cols))
+    rng.shuffle(edges)
+
+    parent = list(range(len(walls)))
+    size = [1] * len(walls)
+    total = len(edges)
+    for n, edge in enumerate(edges, 1):
+        a = edge >> 1
+        if edge & 1:
+            b = a + cols
+            wall, opposite = WALL_TOP, WALL_BOTTOM
+        else:
+            b = a + 1
+            wall, opposite = WALL_RIGHT, WALL_LEFT
+
+        # find com compressão por halving
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        root_b = b
+        while parent[root_b] != root_b:
+            parent[root_b] = parent[parent[root_b]]
+            root_b = parent[root_b]
+        if a != root_b:
+            if size[a] < size[root_b]:
+                a, root_b = root_b, a
+            parent[root_b] = a
+            size[a] += size[root_b]
+            cell = edge >> 1
+            walls[cell] &= ~wall
+            walls[cell + (cols if edge & 1 else 1)] &= ~opposite
+
+        if n % report_every == 0:
+            yield n / total
+
+    if open_ends:
+        open_entrance_and_exit(grid, rng)
+    yield 1.0
+
+
+def prim_steps(grid, rng=None, report_every=256, open_ends=True):
+    """Prim aleatório: cresce a partir de uma célula ligando fronteiras sorteadas"""
+    rng = ensure_rng(rng)
+    walls = grid.walls
+    cols, rows = grid.cols, grid.rows
+    offsets = grid.neighbor_offsets
+    total = len(walls)
+    frontier = []
+    # 1 = fronteira, 2 = dentro do labirinto
+    state = bytearray(total)
+
+    def expand(cell):
+        state[cell] = 2
+        x = cell % cols
+        y = cell // cols
+        for dx, dy, delta, _wall, _opposite in offsets:
+            if 0 <= x + dx < cols and 0 <= y + dy < rows and not state[cell + delta]:
+                state[cell + delta] = 1
+                frontier.append(cell + delta)
+
+    expand(rng.randrange(total))
+    inside = 1
+    choices = []
+    while frontier:
+        # Remoção O(1): troca o sorteado com o último
+        k = rng.randrange(len(frontier))
+        cell = frontier[k]
+        frontier[k] = frontier[-1]
+        frontier.pop()
+
+        x = cell % cols
+        y = cell // cols
+        choices.clear()
+        for dx, dy, delta, wall, opposite in offsets:
+            if 0 <= x + dx < cols and 0 <= y + dy < rows and state[cell + delta] == 2:
+                choices.append((delta, wall, opposite))
+        delta, wall, opposite = rng.choice(choices)
+        walls[cell] &= ~wall
+        walls[cell + delta] &= ~opposite
+        expand(cell)
+        inside += 1
+        if inside % report_every == 0:
+            yield inside / total
+
+    if open_ends:
+        open_entrance_and_exit(grid, rng)
+    yield 1.0
+
+
+def wilson_steps(grid, rng=None, report_every=256, open_ends=True):
+    """Wilson: caminhadas aleatórias com apagamento de laços (árvore uniforme)
+
+    Cada caminhada parte de uma célula fora do labirinto e vai até tocá-lo;
+    direction guarda só a última saída de cada célula, o que apaga os laços
+    sem precisar guardar o caminho.
+    """
+    rng = ensure_rng(rng)
+    walls = grid.walls
+    cols, rows = grid.cols, grid.rows
+    offsets = grid.neighbor_offsets
+    total = len(walls)
+    direction = bytearray(total)
+
+    walls[rng.randrange(total)] |= VISITED
+    inside = 1
+    reported = 0
+    moves = []
+    for origin in range(total):
+        if walls[origin] & VISITED:
+            continue
+
+        cell = origin
+        while not walls[cell] & VISITED:
+            x = cell % cols
+            y = cell // cols
+            moves.clear()
+            for k, (dx, dy, _delta, _wall, _opposite) in enumerate(offsets):
+                if 0 <= x + dx < cols and 0 <= y + dy < rows:
+                    moves.append(k)
+            k = rng.choice(moves)
+            direction[cell] = k
+            cell += offsets[k][2]
+
+        cell = origin
+        while not walls[cell] & VISITED:
+            _dx, _dy, delta, wall, opposite = offsets[direction[cell]]
+            walls[cell] &= ~wall
+            walls[cell] |= VISITED
+            walls[cell + delta] &= ~opposite
+            cell += delta
+            inside += 1
+
+        if inside - reported >= report_every:
+            reported = inside
+            yield inside / total
+
+    grid.clear_visited()
+    if open_ends:
+        open_entrance_and_exit(grid, rng)
+    yield 1.0
+
+
+def growing_tree_steps(grid, rng=None, report_every=256, open_ends=True, newest=0.75):
+    """Growing tree: mistura backtracker (célula mais nova) e Prim (célula sorteada)
+
+    newest é a chance de continuar da célula mais nova; 1.0 equivale ao
+    backtracker e 0.0 a um Prim sobre as células ativas.
+    """
+    rng = ensure_rng(rng)
+    walls = grid.walls
+    cols, rows = grid.cols, grid.rows
+    offsets = grid.neighbor_offsets
+    total = len(walls)
+
+    first = rng.randrange(total)
+    walls[first] |= VISITED
+    active = [first]
+    choices = []
+    visited = 1
+    while active:
+        k = len(active) - 1 if rng.random() < newest else rng.randrange(len(active))
+        cell = active[k]
+        x = cell % cols
+        y = cell // cols
+        choices.clear()
+        for dx, dy, delta, wall, opposite in offsets:
+            if 0 <= x + dx < cols and 0 <= y + dy < rows and not walls[cell + delta] & VISITED:
+                choices.append((delta, wall, opposite))
+        if choices:
+            delta, wall, opposite = rng.choice(choices)
+            walls[cell] &= ~wall
+            walls[cell + delta] &= ~opposite
+            walls[cell + delta] |= VISITED
+            active.append(cell + delta)
+            visited += 1
+            if visited % report_every == 0:
+                yield visited / total
+        else:
+            # Remoção O(1); só a ordem da célula movida muda
+            active[k] = active[-1]
+            active.pop()
+
+    grid.clear_visited()
+    if open_ends:
+        open_entrance_and_exit(grid, rng)
+    yield 1.0
+
+
+# Geradores retomáveis disponíveis, por nome (args "generator" do MazeBuilder)
+# Todos têm a assinatura (grid, rng, report_every, open_ends) e devolvem o progresso
+GENERATOR_STEPS = {
+    'backtracker': backtracker_steps,
+    'eller': eller_steps,
+    'kruskal': kruskal_steps,
+    'prim': prim_steps,
+    'wilson': wilson_steps,
+    'growing_tree': growing_tree_steps,
+}
+
+
+def register_generator(name, steps):
+    """Registra um gerador retomável (mesma assinatura de backtracker_steps)"""
+    GENERATOR_STEPS[name] = steps
+
+
+def generate(grid, name='backtracker', rng=None):
+    """Roda o gerador registrado como name até o fim"""
+    for _progress in GENERATOR_STEPS[name](grid, rng):
+        pass
+    return grid
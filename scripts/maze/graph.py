@@ -0,0 +1,256 @@
+"""
+Grafo contraído do labirinto
+Corredores (células com exatamente duas passagens) viram uma aresta com peso
+e só becos, bifurcações, entrada e saída são nós. A adjacência fica em CSR
+(arrays planos de offsets e destinos), várias vezes menor que a grade, para
+solvers, IA e análises
+"""
+
+import heapq
+from array import array
+
+# Bits ligados por byte (tabela de bytes.translate) e índice do bit mais baixo de cada máscara de direções
+_BIT_COUNT = bytes(bin(m).count('1') for m in range(256))
+_FIRST_BIT = bytes((m & -m).bit_length() - 1 if m else 255 for m in range(16))
+
+
+def open_moves(grid):
+    """
+    bytearray com a máscara de direções abertas de cada célula
+
+    Bit k = grid.neighbor_offsets[k]; como no solver, a passagem só é aberta
+    se nenhum dos dois lados tiver parede.
+    """
+    walls = grid.walls
+    cols, rows = grid.cols, grid.rows
+    offsets = grid.neighbor_offsets
+    moves = bytearray(len(walls))
+    for cell in range(len(walls)):
+        x = cell % cols
+        y = cell // cols
+        w = walls[cell]
+        m = 0
+        for k, (dx, dy, delta, wall, opposite) in enumerate(offsets):
+            if not w & wall and 0 <= x + dx < cols and 0 <= y + dy < rows \
+                    and not walls[cell + delta] & opposite:
+                m |= 1 << k
+        moves[cell] = m
+    return moves
+
+
+def passage_count(moves):
+    """Passagens abertas (cada uma conta uma vez) a partir de open_moves"""
+    return sum(moves.translate(_BIT_COUNT)) // 2
+
+
+class MazeGraph:
+    """
+    Labirinto como grafo de nós (células que não são corredor) em CSR
+
+    As arestas do nó i são offsets[i] até offsets[i + 1] em targets (nó de
+    destino), weights (passos) e directions (direção em grid.neighbor_offsets
+    pela qual o corredor sai do nó). Cada corredor aparece nas duas pontas.
+    cell_node[c] é o nó da célula c, ou -1 se ela estiver no meio de um corredor.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        offsets = grid.neighbor_offsets
+        self._deltas = [delta for _dx, _dy, delta, _wall, _opposite in offsets]
+        self._back = grid.back_directions
+
+        self.moves = open_moves(grid)
+        degree = self.moves.translate(_BIT_COUNT)
+        cells = len(degree)
+        self.cell_node = array('i', [-1]) * cells
+        self.node_cells = array('i')
+        for cell in range(cells):
+            if degree[cell] != 2 or cell == grid.start or cell == grid.exit:
+                self.cell_node[cell] = len(self.node_cells)
+                self.node_cells.append(cell)
+
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.weights = array('i')
+        self.directions = bytearray()
+        corridor = degree.count(2) - sum(1 for c in (grid.start, grid.exit)
+                                         if c is not None and degree[c] == 2)
+        covered = self._build_edges(0)
+        if covered < 2 * corridor:
+            self._add_cycle_nodes(degree)
+
+    def _build_edges(self, first):
+        """Percorre os corredores a partir dos nós first..; devolve as células de corredor visitadas"""
+        moves = self.moves
+        deltas = self._deltas
+        back = self._back
+        cell_node = self.cell_node
+        covered = 0
+        node = first
+        while node < len(self.node_cells):
+            cell = self.node_cells[node]
+            m = moves[cell]
+            while m:
+                k = _FIRST_BIT[m]
+                m &= m - 1
+                current = cell + deltas[k]
+                heading = k
+                steps = 1
+                while cell_node[current] < 0:
+                    heading = _FIRST_BIT[moves[current] & ~(1 << back[heading])]
+                    current += deltas[heading]
+                    steps += 1
+                self.targets.append(cell_node[current])
+                self.weights.append(steps)
+                self.directions.append(k)
+                covered += steps - 1
+            self.offsets.append(len(self.targets))
+            node += 1
+        return covered
+
+    def _add_cycle_nodes(self, degree):
+        """Anéis só de corredor (sem bifurcação) ganham um nó para continuar alcançáveis"""
+        seen = bytearray(len(degree))
+        for node in range(len(self.node_cells)):
+            for j in range(self.offsets[node], self.offsets[node + 1]):
+                for cell in self.edge_cells(node, j):
+                    seen[cell] = 1
+        for cell in range(len(degree)):
+            if degree[cell] == 2 and self.cell_node[cell] < 0 and not seen[cell]:
+                first = len(self.node_cells)
+                self.cell_node[cell] = first
+                self.node_cells.append(cell)
+                self._build_edges(first)
+                for j in range(self.offsets[first], self.offsets[first + 1]):
+                    for ring_cell in self.edge_cells(first, j):
+                        seen[ring_cell] = 1
+
+    def __len__(self):
+        return len(self.node_cells)
+
+    @property
+    def edge_count(self):
+        """Arestas sem direção (cada corredor conta uma vez)"""
+        return len(self.targets) // 2
+
+    def neighbors(self, node):
+        """(nó vizinho, passos) de cada corredor que sai do nó"""
+        for j in range(self.offsets[node], self.offsets[node + 1]):
+            yield self.targets[j], self.weights[j]
+
+    def walk(self, cell, k):
+        """Células do corredor saindo de cell pela direção k, até a célula do próximo nó (inclusive)"""
+        moves = self.moves
+        deltas = self._deltas
+        cell_node = self.cell_node
+        current = cell + deltas[k]
+        cells = []
+        while cell_node[current] < 0:
+            cells.append(current)
+            k = _FIRST_BIT[moves[current] & ~(1 << self._back[k])]
+            current += deltas[k]
+        cells.append(current)
+        return cells
+
+    def edge_cells(self, node, j):
+        """Células da aresta j (índice em targets) a partir do nó, sem a célula do próprio nó"""
+        return self.walk(self.node_cells[node], self.directions[j])
+
+    def locate(self, cell):
+        """
+        Nós mais próximos de uma célula: [(nó, células até ele)]
+
+        Um nó devolve só ele mesmo (lista vazia de células); uma célula de
+        corredor devolve as duas pontas do corredor.
+        """
+        node = self.cell_node[cell]
+        if node >= 0:
+            return [(node, [])]
+        moves = self.moves[cell]
+        anchors = []
+        while moves:
+            k = _FIRST_BIT[moves]
+            moves &= moves - 1
+            cells = self.walk(cell, k)
+            anchors.append((self.cell_node[cells[-1]], cells))
+        return anchors
+
+    def distances(self, cell):
+        """Dijkstra a partir de uma célula: passos até cada nó (array 'i', -1 = inalcançável)"""
+        dist = array('i', [-1]) * len(self.node_cells)
+        heap = [(len(cells), node) for node, cells in self.locate(cell)]
+        heapq.heapify(heap)
+        while heap:
+            d, node = heapq.heappop(heap)
+            if dist[node] >= 0:
+                continue
+            dist[node] = d
+            for j in range(self.offsets[node], self.offsets[node + 1]):
+                if dist[self.targets[j]] < 0:
+                    heapq.heappush(heap, (d + self.weights[j], self.targets[j]))
+        return dist
+
+    def shortest_path(self, source, target):
+        """Células do caminho mais curto de source até target (inclusive); [] se não houver"""
+        if source == target:
+            return [source]
+        sources = self.locate(source)
+        # Nó -> células do alvo até ele (a menor, se as duas pontas do corredor derem no mesmo nó)
+        goals = {}
+        for node, cells in self.locate(target):
+            if node not in goals or len(cells) < len(goals[node]):
+                goals[node] = cells
+
+        # Alvo no mesmo corredor da origem: caminho direto, sem passar por nó
+        best = None
+        for _node, cells in sources:
+            if target in cells:
+                best = [source] + cells[:cells.index(target) + 1]
+                break
+        best_length = len(best) - 1 if best else None
+
+        # Dijkstra sobre os nós; prev guarda (nó anterior, aresta) para expandir o caminho
+        count = len(self.node_cells)
+        dist = array('i', [-1]) * count
+        prev = {}
+        heap = []
+        # Na origem a "aresta" é o índice da ponta em sources
+        for i, (node, cells) in enumerate(sources):
+            heap.append((len(cells), node, -1, i))
+        heapq.heapify(heap)
+        finish = None
+        while heap:
+            d, node, from_node, edge = heapq.heappop(heap)
+            if dist[node] >= 0:
+                continue
+            if best_length is not None and d >= best_length:
+                break
+            dist[node] = d
+            prev[node] = (from_node, edge)
+            if node in goals:
+                total = d + len(goals[node])
+                if best_length is None or total < best_length:
+                    best_length = total
+                    finish = node
+            for j in range(self.offsets[node], self.offsets[node + 1]):
+                if dist[self.targets[j]] < 0:
+                    heapq.heappush(heap, (d + self.weights[j], self.targets[j], node, j))
+
+        if finish is None:
+            return best or []
+
+        chain = []
+        node = finish
+        while node >= 0:
+            from_node, edge = prev[node]
+            chain.append((from_node, edge, node))
+            node = from_node
+        chain.reverse()
+
+        path = [source] + sources[chain[0][1]][1]
+        for from_node, edge, _node in chain[1:]:
+            path.extend(self.edge_cells(from_node, edge))
+        path.extend(reversed(goals[finish][:-1]))
+        if path[-1] != target:
+            path.append(target)
+        return path
@@ -0,0 +1,121 @@
+"""
+Grade do labirinto
+Um byte por célula: máscara de paredes (4 bits baixos) + flag de visitado
+"""
+
+import hashlib
+
+# Bits da máscara de paredes de cada célula (4 bits baixos) + flag de visitado
+WALL_TOP = 1
+WALL_RIGHT = 2
+WALL_BOTTOM = 4
+WALL_LEFT = 8
+WALL_ALL = WALL_TOP | WALL_RIGHT | WALL_BOTTOM | WALL_LEFT
+VISITED = 16
+
+WALL_SIDES = (
+    ('top', WALL_TOP),
+    ('bottom', WALL_BOTTOM),
+    ('left', WALL_LEFT),
+    ('right', WALL_RIGHT),
+)
+
+# Tabela para limpar o bit de visitado de toda a grade com bytes.translate
+_STRIP_VISITED = bytes(b & WALL_ALL for b in range(256))
+
+
+def level_size(level):
+    """Retorna (rows, cols) do labirinto para um nível"""
+    base = 6
+    size = base + max(1, int(level)) * 2
+    return size, size
+
+
+def level_seed(base_seed, level, variant=0):
+    """Semente determinística (64 bits) de um nível; variant troca o layout"""
+    data = f"{int(base_seed)}:{int(level)}:{int(variant)}".encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def back_directions(offsets):
+    """Para cada direção k de neighbor_offsets, a que volta do vizinho (left <-> right, down <-> up)"""
+    return tuple(next(k for k, o in enumerate(offsets) if o[3] == opposite)
+                 for _dx, _dy, _delta, _wall, opposite in offsets)
+
+
+class MazeGrid:
+    """Grade plana de paredes, independente da engine"""
+
+    def __init__(self, rows, cols, walls=None):
+        """walls: buffer gravável de rows * cols bytes (ex.: memoryview de memória compartilhada), usado como está"""
+        self.rows = rows
+        self.cols = cols
+        self.walls = bytearray([WALL_ALL]) * (rows * cols) if walls is None else walls
+        self.start = None
+        self.exit = None
+
+        # (dx, dy, delta de índice, parede na célula atual, parede no vizinho)
+        self.neighbor_offsets = (
+            (-1, 0, -1, WALL_LEFT, WALL_RIGHT),
+            (1, 0, 1, WALL_RIGHT, WALL_LEFT),
+            (0, -1, -cols, WALL_BOTTOM, WALL_TOP),
+            (0, 1, cols, WALL_TOP, WALL_BOTTOM),
+        )
+        self.back_directions = back_directions(self.neighbor_offsets)
+
+    def __len__(self):
+        return len(self.walls)
+
+    def reset(self):
+        """Fecha todas as paredes e limpa visitados"""
+        self.walls[:] = bytearray([WALL_ALL]) * len(self.walls)
+        self.start = None
+        self.exit = None
+
+    def assign(self, walls, start, exit):
+        """Copia paredes/entrada/saída já geradas (ex.: por um worker) para esta grade"""
+        self.walls[:] = walls
+        self.start = start
+        self.exit = exit
+
+    def clear_visited(self):
+        walls = self.walls
+        if not isinstance(walls, bytearray):
+            walls = bytes(walls)
+        self.walls[:] = walls.translate(_STRIP_VISITED)
+
+    def index(self, x, y):
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return y * self.cols + x
+        return None
+
+    def coords(self, i):
+        return i % self.cols, i // self.cols
+
+    def has_wall(self, x, y, wall):
+        return bool(self.walls[y * self.cols + x] & wall)
+
+    def remove_wall(self, i, wall):
+        """Remove a parede da célula i e a parede correspondente do vizinho"""
+        self.walls[i] &= ~wall
+        for _dx, _dy, delta, own, opposite in self.neighbor_offsets:
+            if own == wall:
+                x, y = self.coords(i)
+                if self.index(x + _dx, y + _dy) is not None:
+                    self.walls[i + delta] &= ~opposite
+                break
+
+    def cell_position(self, i, cell_size):
+        """Posição local (x, y, z) do centro da célula i"""
+        x, y = self.coords(i)
+        return (x * cell_size, y * cell_size, 0)
+
+    def start_position(self, cell_size):
+        if self.start is None:
+            return None
+        return self.cell_position(self.start, cell_size)
+
+    def exit_position(self, cell_size):
+        if self.exit is None:
+            return None
+        return self.cell_position(self.exit, cell_size)
@@ -0,0 +1,227 @@
+"""
+Pathfinding hierárquico (HPA*) para níveis grandes
+A grade é dividida em clusters (os mesmos chunks da malha); cada passagem
+aberta na borda entre dois clusters vira um par de nós abstratos. Os custos
+entre entradas do mesmo cluster saem de um BFS restrito ao cluster, calculado
+na primeira vez que a busca passa por ele e guardado. Consultas rodam A* sobre
+esse grafo pequeno e só refinam em células os trechos pedidos.
+"""
+
+import heapq
+
+from .graph import open_moves
+
+
+class HierarchicalPathfinder:
+    """
+    HPA* sobre uma grade; consultas entre quaisquer duas células
+
+    Toda passagem de borda é uma entrada (não há agrupamento), então as
+    distâncias do grafo abstrato são exatas, não aproximadas.
+    Se as paredes mudarem, chame invalidate().
+    """
+
+    def __init__(self, grid, cluster_size=16):
+        self.grid = grid
+        self.cluster_size = max(2, int(cluster_size))
+        self.moves = open_moves(grid)
+        cols, rows = grid.cols, grid.rows
+        self.clusters_x = -(-cols // self.cluster_size)
+        self.clusters_y = -(-rows // self.cluster_size)
+        self._steps = [(dx, dy, delta) for dx, dy, delta, _wall, _opposite in grid.neighbor_offsets]
+        # Adjacência abstrata já calculada, por cluster: {entrada: [(vizinho, passos)]}
+        self._edges = {}
+        self._find_entrances()
+
+    def _find_entrances(self):
+        """entrances[cluster] = células de borda com passagem; crossings[célula] = vizinhos do outro lado"""
+        cols = self.grid.cols
+        moves = self.moves
+        self.entrances = [[] for _i in range(self.clusters_x * self.clusters_y)]
+        self.crossings = {}
+        for cell in range(len(moves)):
+            m = moves[cell]
+            if not m:
+                continue
+            x, y = cell % cols, cell // cols
+            own = self.cluster_of(cell)
+            for k, (dx, dy, delta) in enumerate(self._steps):
+                if m & (1 << k) and self._cluster_xy(x + dx, y + dy) != own:
+                    if cell not in self.crossings:
+                        self.crossings[cell] = []
+                        self.entrances[own].append(cell)
+                    self.crossings[cell].append(cell + delta)
+
+    def _cluster_xy(self, x, y):
+        return (y // self.cluster_size) * self.clusters_x + x // self.cluster_size
+
+    def cluster_of(self, cell):
+        cols = self.grid.cols
+        return self._cluster_xy(cell % cols, cell // cols)
+
+    def cluster_bounds(self, cluster):
+        """(x0, y0, x1, y1) do cluster, com x1/y1 exclusivos"""
+        size = self.cluster_size
+        x0 = (cluster % self.clusters_x) * size
+        y0 = (cluster // self.clusters_x) * size
+        return x0, y0, min(x0 + size, self.grid.cols), min(y0 + size, self.grid.rows)
+
+    def local_search(self, source, cluster=None):
+        """BFS a partir de source sem sair do cluster: (dist, prev) em dicts por célula"""
+        cluster = self.cluster_of(source) if cluster is None else cluster
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+        cols = self.grid.cols
+        moves = self.moves
+        steps = self._steps
+        dist = {source: 0}
+        prev = {source: -1}
+        queue = [source]
+        for cell in queue:
+            m = moves[cell]
+            x, y = cell % cols, cell // cols
+            d = dist[cell] + 1
+            for k, (dx, dy, delta) in enumerate(steps):
+                neighbor = cell + delta
+                if m & (1 << k) and x0 <= x + dx < x1 and y0 <= y + dy < y1 and neighbor not in dist:
+                    dist[neighbor] = d
+                    prev[neighbor] = cell
+                    queue.append(neighbor)
+        return dist, prev
+
+    def cluster_edges(self, cluster):
+        """{entrada: [(vizinho abstrato, passos)]}, calculado uma vez por cluster
+
+        Inclui as travessias da borda (custo 1) e as outras entradas do cluster.
+        """
+        edges = self._edges.get(cluster)
+        if edges is None:
+            entrances = self.entrances[cluster]
+            edges = {cell: [(other, 1) for other in self.crossings[cell]] for cell in entrances}
+            # Custos simétricos: um BFS por entrada preenche os dois sentidos
+            for i, cell in enumerate(entrances[:-1]):
+                dist, _prev = self.local_search(cell, cluster)
+                for other in entrances[i + 1:]:
+                    if other in dist:
+                        edges[cell].append((other, dist[other]))
+                        edges[other].append((cell, dist[other]))
+            self._edges[cluster] = edges
+        return edges
+
+    def invalidate(self):
+        """Paredes mudaram: refaz passagens e entradas e esquece os custos guardados"""
+        self.moves = open_moves(self.grid)
+        self._edges.clear()
+        self._find_entrances()
+
+    def warm_steps(self):
+        """Calcula os custos de todos os clusters (retomável), para não pagar na primeira consulta"""
+        total = len(self.entrances)
+        for cluster in range(total):
+            self.cluster_edges(cluster)
+            yield (cluster + 1) / total
+
+    def find_abstract(self, source, target):
+        """
+        A* sobre o grafo abstrato
+
+        Returns:
+            (passos, waypoints): waypoints começa em source, termina em target e
+            tem as entradas usadas no meio; (-1, []) se não houver caminho
+        """
+        if source == target:
+            return 0, [source]
+        cols = self.grid.cols
+        tx, ty = target % cols, target // cols
+
+        def estimate(cell):
+            return abs(cell % cols - tx) + abs(cell // cols - ty)
+
+        source_cluster = self.cluster_of(source)
+        target_cluster = self.cluster_of(target)
+        source_dist, _prev = self.local_search(source, source_cluster)
+        target_dist, _prev = self.local_search(target, target_cluster)
+
+        best_cost = source_dist.get(target, -1) if source_cluster == target_cluster else -1
+        best_parent = source if best_cost >= 0 else None
+
+        parents = {source: None}
+        cost = {source: 0}
+        heap = []
+        for cell in self.entrances[source_cluster]:
+            d = source_dist.get(cell)
+            if d is not None and cell != source:
+                cost[cell] = d
+                parents[cell] = source
+                heapq.heappush(heap, (d + estimate(cell), d, cell))
+        if source in self.crossings:
+            heapq.heappush(heap, (estimate(source), 0, source))
+
+        closed = set()
+        while heap:
+            f, g, cell = heapq.heappop(heap)
+            if best_cost >= 0 and f >= best_cost:
+                break
+            if cell in closed or g > cost.get(cell, g):
+                continue
+            closed.add(cell)
+
+            cluster = self.cluster_of(cell)
+            if cluster == target_cluster and cell in target_dist:
+                total = g + target_dist[cell]
+                if best_cost < 0 or total < best_cost:
+                    best_cost = total
+                    best_parent = cell
+            for other, steps in self.cluster_edges(cluster).get(cell, ()):
+                d = g + steps
+                if other not in closed and d < cost.get(other, d + 1):
+                    cost[other] = d
+                    parents[other] = cell
+                    heapq.heappush(heap, (d + estimate(other), d, other))
+
+        if best_cost < 0:
+            return -1, []
+        waypoints = [target]
+        cell = best_parent
+        while cell is not None:
+            if cell != waypoints[-1]:
+                waypoints.append(cell)
+            cell = parents[cell]
+        waypoints.reverse()
+        return best_cost, waypoints
+
+    def refine(self, a, b):
+        """Células de a até b (sem a, com b): vizinhos diretos ou BFS dentro do cluster"""
+        if b in self.crossings.get(a, ()):
+            return [b]
+        dist, prev = self.local_search(a, self.cluster_of(a))
+        if b not in dist:
+            return []
+        cells = []
+        cell = b
+        while cell != a:
+            cells.append(cell)
+            cell = prev[cell]
+        cells.reverse()
+        return cells
+
+    def find_path(self, source, target):
+        """Caminho completo em células, de source até target (inclusive); [] se não houver"""
+        _cost, waypoints = self.find_abstract(source, target)
+        if not waypoints:
+            return []
+        path = [waypoints[0]]
+        for a, b in zip(waypoints, waypoints[1:]):
+            path.extend(self.refine(a, b))
+        return path
+
+    def next_step(self, source, target):
+        """Próxima célula de source rumo a target (refina só o primeiro trecho); None se não houver"""
+        _cost, waypoints = self.find_abstract(source, target)
+        if len(waypoints) < 2:
+            return None
+        cells = self.refine(waypoints[0], waypoints[1])
+        return cells[0] if cells else None
+
+    def distance(self, source, target):
+        """Passos entre duas células; -1 se não houver caminho"""
+        return self.find_abstract(source, target)[0]
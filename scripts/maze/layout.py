@@ -0,0 +1,179 @@
+"""
+Planejamento do nível sobre campos de distância
+Entrada e saída nas pontas do diâmetro do labirinto (duas passadas de BFS)
+e checkpoints/coletáveis em distâncias-alvo, tudo em O(células)
+"""
+
+from .generators import open_entrance_and_exit
+from .grid import WALL_TOP, WALL_BOTTOM, WALL_LEFT, WALL_RIGHT
+from .solver import DistanceField, NO_STEP
+
+# Modos de entrada/saída (args "layout" do MazeBuilder)
+# random: coluna sorteada na primeira e na última linha (comportamento original)
+# diameter: as duas células mais distantes entre si; o caminho é sempre o mais longo possível
+LAYOUTS = ('diameter', 'random')
+
+
+def farthest_cell(field):
+    """Célula com a maior distância no campo (a de menor índice em caso de empate)"""
+    dist = field.dist
+    return dist.index(max(dist))
+
+
+class DiameterLayout:
+    """
+    Entrada e saída nas pontas do diâmetro (maior caminho mais curto)
+
+    Primeira passada: BFS a partir da célula 0 acha uma ponta (a saída).
+    Segunda passada: BFS a partir dela acha a outra (a entrada). Em um
+    labirinto perfeito (árvore) isso é o diâmetro exato. O campo da segunda
+    passada já é o campo até a saída, então serve direto como solver.
+    Nenhuma parede é aberta: entrada e saída podem ficar no meio da grade.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.field = None
+        self.diameter = 0
+        self.ready = False
+
+    def compute_steps(self, report_every=4096):
+        """As duas passadas de BFS, retomáveis; devolve o progresso de 0 a 1"""
+        grid = self.grid
+        first = DistanceField(grid, 0)
+        for progress in first.compute_steps(report_every):
+            yield 0.5 * progress
+        exit = farthest_cell(first)
+        del first
+
+        field = DistanceField(grid, exit)
+        for progress in field.compute_steps(report_every):
+            yield 0.5 + 0.5 * progress
+        grid.start = farthest_cell(field)
+        grid.exit = exit
+        # A entrada só é conhecida depois do BFS: refaz o caminho marcado
+        field._mark_path()
+        self.field = field
+        self.diameter = field.distance(grid.start)
+        self.ready = True
+        yield 1.0
+
+    def compute(self):
+        for _progress in self.compute_steps():
+            pass
+        return self
+
+
+def place_ends(grid, layout='diameter', rng=None):
+    """
+    Define entrada e saída de uma grade recém-gerada (com open_ends=False)
+
+    Returns:
+        DistanceField até a saída já calculado (layout 'diameter') ou None
+    """
+    if layout == 'diameter':
+        return DiameterLayout(grid).compute().field
+    open_entrance_and_exit(grid, rng)
+    return None
+
+
+def exit_marker_offset(grid):
+    """
+    Deslocamento (x, y, z) do sensor de saída a partir do centro da célula de saída
+
+    Vem das paredes da própria saída, não do layout configurado (um pack ou
+    cache pode ter outro): se uma parede externa dela foi aberta ('random'
+    abre a de cima), o sensor fica logo depois da abertura; senão ('diameter',
+    beco interno) fica na própria célula, só acima do chão.
+    """
+    if grid.exit is not None:
+        x, y = grid.coords(grid.exit)
+        for outside, wall, dx, dy in ((y == grid.rows - 1, WALL_TOP, 0, 1.5),
+                                      (y == 0, WALL_BOTTOM, 0, -1.5),
+                                      (x == grid.cols - 1, WALL_RIGHT, 1.5, 0),
+                                      (x == 0, WALL_LEFT, -1.5, 0)):
+            if outside and not grid.walls[grid.exit] & wall:
+                return (dx, dy, 1)
+    return (0, 0, 1)
+
+
+class LevelLayout:
+    """Células planejadas do nível: checkpoints no caminho e coletáveis fora dele"""
+
+    def __init__(self, start, exit, path_length, checkpoints, collectibles):
+        self.start = start
+        self.exit = exit
+        self.path_length = path_length
+        self.checkpoints = checkpoints
+        self.collectibles = collectibles
+
+
+def checkpoint_cells(field, count):
+    """count células do caminho entrada -> saída em distâncias iguais (sem as pontas)"""
+    path = field.path()
+    length = len(path) - 1
+    cells = []
+    for k in range(1, count + 1):
+        cell = path[round(length * k / (count + 1))] if length > 1 else None
+        if cell is not None and cell not in (path[0], path[-1]) and (not cells or cells[-1] != cell):
+            cells.append(cell)
+    return cells
+
+
+def dead_ends(field):
+    """Folhas da árvore do BFS (becos sem saída), fora do caminho, da entrada e da saída"""
+    grid = field.grid
+    toward = field.toward
+    deltas = [delta for _dx, _dy, delta, _wall, _opposite in grid.neighbor_offsets]
+    children = bytearray(len(toward))
+    for cell, k in enumerate(toward):
+        if k != NO_STEP:
+            children[cell + deltas[k]] = 1
+
+    dist = field.dist
+    path_mask = field.path_mask
+    return [cell for cell in range(len(toward))
+            if not children[cell] and dist[cell] > 0 and not path_mask[cell] and cell != grid.start]
+
+
+def collectible_cells(field, count, rng=None):
+    """
+    count becos sem saída com distâncias até a saída espalhadas entre 1 e a máxima
+
+    Alvo k: max_dist * (k + 1) / (count + 1); vale o beco livre mais próximo
+    do alvo (sorteado entre os empatados quando há rng).
+    """
+    if count <= 0:
+        return []
+    dist = field.dist
+    buckets = {}
+    for cell in dead_ends(field):
+        buckets.setdefault(dist[cell], []).append(cell)
+    if not buckets:
+        return []
+
+    max_dist = max(buckets)
+    cells = []
+    for k in range(count):
+        if not buckets:
+            break
+        target = round(max_dist * (k + 1) / (count + 1))
+        offset = 0
+        while target - offset not in buckets and target + offset not in buckets:
+            offset += 1
+        d = target + offset if target + offset in buckets else target - offset
+        bucket = buckets[d]
+        i = rng.randrange(len(bucket)) if rng is not None else 0
+        bucket[i], bucket[-1] = bucket[-1], bucket[i]
+        cells.append(bucket.pop())
+        if not bucket:
+            del buckets[d]
+    return cells
+
+
+def plan_layout(field, checkpoints=0, collectibles=0, rng=None):
+    """LevelLayout a partir do campo até a saída (o solver do nível)"""
+    grid = field.grid
+    return LevelLayout(grid.start, grid.exit, field.path_length(),
+                       checkpoint_cells(field, checkpoints),
+                       collectible_cells(field, collectibles, rng))
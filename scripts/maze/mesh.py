@@ -0,0 +1,194 @@
+"""
+Geometria das paredes do labirinto
+Converte a grade de paredes em caixas (centro x/y, largura, espessura, faces)
+"""
+
+from .grid import WALL_TOP, WALL_BOTTOM, WALL_LEFT, WALL_RIGHT, WALL_SIDES
+
+# Faces de uma caixa de parede (mesma ordem de add_wall_data)
+FACE_FRONT = 1    # -y
+FACE_BACK = 2     # +y
+FACE_RIGHT = 4    # +x
+FACE_LEFT = 8     # -x
+FACE_TOP = 16     # +z
+FACE_BOTTOM = 32  # -z, apoiada no chão
+FACE_ALL = 63
+
+
+def horizontal_wall_rows(grid):
+    """Para cada linha divisória j (0..rows), bytearray com 1 onde há parede"""
+    walls = grid.walls
+    rows, cols = grid.rows, grid.cols
+    lines = []
+    for j in range(rows + 1):
+        line = bytearray(cols)
+        if j < rows:
+            base = j * cols
+            for x in range(cols):
+                if walls[base + x] & WALL_BOTTOM:
+                    line[x] = 1
+        if j > 0:
+            base = (j - 1) * cols
+            for x in range(cols):
+                if walls[base + x] & WALL_TOP:
+                    line[x] = 1
+        lines.append(line)
+    return lines
+
+
+def vertical_wall_cols(grid):
+    """Para cada linha divisória i (0..cols), bytearray com 1 onde há parede"""
+    walls = grid.walls
+    rows, cols = grid.rows, grid.cols
+    lines = []
+    for i in range(cols + 1):
+        line = bytearray(rows)
+        for y in range(rows):
+            base = y * cols
+            if (i < cols and walls[base + i] & WALL_LEFT) or (i > 0 and walls[base + i - 1] & WALL_RIGHT):
+                line[y] = 1
+        lines.append(line)
+    return lines
+
+
+def runs(line):
+    """Sequências máximas (início, fim inclusivo) de 1s em um bytearray"""
+    start = line.find(1)
+    while start != -1:
+        end = line.find(0, start)
+        if end == -1:
+            end = len(line)
+        yield start, end - 1
+        start = line.find(1, end)
+
+
+class _Lattice:
+    """Segmentos de parede nas linhas divisórias, para consultas de vizinhança"""
+
+    def __init__(self, grid):
+        self.h = horizontal_wall_rows(grid)
+        self.v = vertical_wall_cols(grid)
+        self.rows = grid.rows
+        self.cols = grid.cols
+
+    def has_h(self, j, x):
+        return 0 <= x < self.cols and bool(self.h[j][x])
+
+    def has_v(self, i, y):
+        return 0 <= y < self.rows and bool(self.v[i][y])
+
+    def h_cap_hidden(self, i, j, outside):
+        """Tampa de uma parede horizontal no canto (i, j); outside = segmento além do canto"""
+        return self.has_h(j, outside) or (self.has_v(i, j - 1) and self.has_v(i, j))
+
+    def v_cap_hidden(self, i, j, outside):
+        """Tampa de uma parede vertical no canto (i, j); outside = segmento além do canto"""
+        return self.has_v(i, outside) or (self.has_h(j, i - 1) and self.has_h(j, i))
+
+    def h_faces(self, j, x0, x1):
+        faces = FACE_ALL & ~FACE_BOTTOM
+        if self.h_cap_hidden(x0, j, x0 - 1):
+            faces &= ~FACE_LEFT
+        if self.h_cap_hidden(x1 + 1, j, x1 + 1):
+            faces &= ~FACE_RIGHT
+        return faces
+
+    def v_faces(self, i, y0, y1):
+        faces = FACE_ALL & ~FACE_BOTTOM
+        if self.v_cap_hidden(i, y0, y0 - 1):
+            faces &= ~FACE_FRONT
+        if self.v_cap_hidden(i, y1 + 1, y1 + 1):
+            faces &= ~FACE_BACK
+        return faces
+
+
+def cell_wall_boxes(grid, cell_size, wall_thickness, cull=False):
+    """Uma caixa por lado de parede de cada célula
+
+    Sem cull as paredes internas saem duplicadas (uma por célula); com cull
+    cada parede sai uma vez e as faces escondidas são removidas.
+    """
+    cs = cell_size
+    wt = wall_thickness
+    cols = grid.cols
+    half = cs / 2
+    lattice = _Lattice(grid) if cull else None
+    seen_h = set()
+    seen_v = set()
+
+    for i, mask in enumerate(grid.walls):
+        cx, cy = i % cols, i // cols
+        x = cx * cs
+        y = cy * cs
+
+        for side, bit in WALL_SIDES:
+            if not mask & bit:
+                continue
+            if side in ('top', 'bottom'):
+                j = cy + 1 if side == 'top' else cy
+                faces = FACE_ALL
+                if cull:
+                    if (j, cx) in seen_h:
+                        continue
+                    seen_h.add((j, cx))
+                    faces = lattice.h_faces(j, cx, cx)
+                yield x, j * cs - half, cs, wt, side, faces
+            else:
+                k = cx + 1 if side == 'right' else cx
+                faces = FACE_ALL
+                if cull:
+                    if (k, cy) in seen_v:
+                        continue
+                    seen_v.add((k, cy))
+                    faces = lattice.v_faces(k, cy, cy)
+                yield k * cs - half, y, wt, cs, side, faces
+
+
+def merged_wall_boxes(grid, cell_size, wall_thickness, cull=False):
+    """Uma caixa por sequência máxima de paredes colineares (sem duplicatas)"""
+    cs = cell_size
+    wt = wall_thickness
+    half = cs / 2
+    lattice = _Lattice(grid)
+
+    for j, line in enumerate(lattice.h):
+        y = j * cs - half
+        for x0, x1 in runs(line):
+            faces = lattice.h_faces(j, x0, x1) if cull else FACE_ALL
+            yield (x0 + x1) * half, y, (x1 - x0 + 1) * cs, wt, 'horizontal', faces
+
+    for i, line in enumerate(lattice.v):
+        x = i * cs - half
+        for y0, y1 in runs(line):
+            faces = lattice.v_faces(i, y0, y1) if cull else FACE_ALL
+            yield x, (y0 + y1) * half, wt, (y1 - y0 + 1) * cs, 'vertical', faces
+
+
+def wall_boxes(grid, cell_size, wall_thickness, merge=True, cull=False):
+    if merge:
+        return merged_wall_boxes(grid, cell_size, wall_thickness, cull)
+    return cell_wall_boxes(grid, cell_size, wall_thickness, cull)
+
+
+class MeshUpload:
+    """
+    Malha já no formato da engine, pronta para o slot
+
+    vertices: lista de {'pos', 'normal'} (addVerticesBatch); indices: lista
+    plana com 3 por triângulo (addIndex em blocos). Montar isso custa mais
+    que gerar a malha, então o pré-carregamento faz a conversão no worker.
+    """
+
+    __slots__ = ('vertices', 'indices')
+
+    def __init__(self, vertices, indices):
+        self.vertices = vertices
+        self.indices = indices
+
+    @property
+    def vertex_count(self):
+        return len(self.vertices)
+
+    @property
+    def triangle_count(self):
+        return len(self.indices) // 3
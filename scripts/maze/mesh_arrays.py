@@ -0,0 +1,271 @@
+"""
+Construtor vetorizado da malha das paredes (NumPy)
+Gera posições, normais e índices de todo o labirinto em buffers contíguos
+"""
+
+import numpy as np
+
+from .grid import WALL_TOP, WALL_BOTTOM, WALL_LEFT, WALL_RIGHT
+from .mesh import FACE_FRONT, FACE_BACK, FACE_RIGHT, FACE_LEFT, FACE_TOP, FACE_BOTTOM, FACE_ALL, MeshUpload
+
+# Cantos da caixa: (usa max_x, usa max_y, usa max_z), mesma ordem de add_wall_data
+_CORNERS = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),
+], dtype=bool)
+
+_FACE_BITS = np.array([FACE_FRONT, FACE_BACK, FACE_RIGHT, FACE_LEFT, FACE_TOP, FACE_BOTTOM], dtype=np.uint8)
+_FACE_QUADS = np.array([
+    (0, 1, 5, 4),
+    (2, 3, 7, 6),
+    (1, 2, 6, 5),
+    (3, 0, 4, 7),
+    (4, 5, 6, 7),
+    (0, 3, 2, 1),
+])
+_FACE_NORMALS = np.array([
+    (0, -1, 0),
+    (0, 1, 0),
+    (1, 0, 0),
+    (-1, 0, 0),
+    (0, 0, 1),
+    (0, 0, -1),
+], dtype=np.float32)
+_QUAD_TRIS = np.array([(0, 1, 2), (0, 2, 3)], dtype=np.uint32)
+
+
+class MeshArrays:
+    """Buffers da malha: positions/normals (N, 3) float32 e indices (M, 3) uint32"""
+
+    __slots__ = ('positions', 'normals', 'indices')
+
+    def __init__(self, positions, normals, indices):
+        self.positions = positions
+        self.normals = normals
+        self.indices = indices
+
+    @property
+    def vertex_count(self):
+        return len(self.positions)
+
+    @property
+    def triangle_count(self):
+        return len(self.indices)
+
+    @property
+    def nbytes(self):
+        return self.positions.nbytes + self.normals.nbytes + self.indices.nbytes
+
+
+def vertex_dicts(arrays, first=0, last=None):
+    """Vértices first..last de um MeshArrays como {'pos', 'normal'} (formato de addVerticesBatch)"""
+    positions = arrays.positions[first:last].tolist()
+    normals = arrays.normals[first:last].tolist()
+    return [{'pos': pos, 'normal': normal} for pos, normal in zip(positions, normals)]
+
+
+def upload_data(arrays):
+    """MeshUpload (listas Python para a engine) de um MeshArrays"""
+    return MeshUpload(vertex_dicts(arrays), arrays.indices.reshape(-1).tolist())
+
+
+def prepare_uploads(meshes):
+    """Converte o resultado de build_mesh_arrays / build_chunk_mesh_arrays (ou None) em MeshUpload"""
+    if meshes is None:
+        return None
+    if isinstance(meshes, dict):
+        return {key: upload_data(arrays) for key, arrays in meshes.items()}
+    return upload_data(meshes)
+
+
+def wall_array(grid):
+    """Visão (rows, cols) uint8 gravável da grade, sem cópia (bytearray compartilhado)"""
+    return np.frombuffer(grid.walls, dtype=np.uint8).reshape(grid.rows, grid.cols)
+
+
+def wall_lattice(walls):
+    """Segmentos de parede: h (rows + 1, cols) e v (rows, cols + 1), booleanos"""
+    rows, cols = walls.shape
+    h = np.zeros((rows + 1, cols), dtype=bool)
+    h[:rows] |= (walls & WALL_BOTTOM) != 0
+    h[1:] |= (walls & WALL_TOP) != 0
+    v = np.zeros((rows, cols + 1), dtype=bool)
+    v[:, :cols] |= (walls & WALL_LEFT) != 0
+    v[:, 1:] |= (walls & WALL_RIGHT) != 0
+    return h, v
+
+
+def _runs(lines, merge, split=0, offset=0):
+    """(linha, início, fim inclusivo) das sequências de True em cada linha
+
+    split > 0 quebra as sequências nas fronteiras de chunk (múltiplos de
+    split, contando a partir de -offset quando lines é uma janela).
+    """
+    if not merge:
+        line, start = np.nonzero(lines)
+        return line, start, start
+    prev = np.zeros_like(lines)
+    prev[:, 1:] = lines[:, :-1]
+    nxt = np.zeros_like(lines)
+    nxt[:, :-1] = lines[:, 1:]
+    if split:
+        col = np.arange(lines.shape[1]) + offset
+        prev[:, col % split == 0] = False
+        nxt[:, (col + 1) % split == 0] = False
+    line, start = np.nonzero(lines & ~prev)
+    _, end = np.nonzero(lines & ~nxt)
+    return line, start, end
+
+
+def wall_box_arrays(walls, cell_size, wall_thickness, merge=True, cull=True, chunk_size=0,
+                    origin=(0, 0), size=None):
+    """Caixas das paredes como arrays: (min_x, min_y, max_x, max_y, faces, chunks)
+
+    chunks é (n, 2) com o chunk (cx, cy) de cada caixa; com chunk_size = 0
+    tudo fica no chunk (0, 0) e as sequências não são quebradas.
+    walls pode ser uma janela da grade: origin = (x0, y0) dela e size =
+    (rows, cols) da grade inteira; posições e chunks saem na grade inteira.
+    Só as caixas longe da borda da janela (que não é a da grade) saem iguais.
+    """
+    ox, oy = origin
+    rows, cols = walls.shape if size is None else size
+    cs = cell_size
+    half = cs / 2
+    half_t = wall_thickness / 2
+    h, v = wall_lattice(walls)
+
+    # Versões com borda falsa para consultar vizinhos fora da grade
+    hp = np.pad(h, ((0, 0), (1, 1)))
+    vp = np.pad(v, ((1, 1), (0, 0)))
+
+    hj, hx0, hx1 = _runs(h, merge, chunk_size, ox)
+    vi, vy0, vy1 = _runs(v.T, merge, chunk_size, oy)
+
+    h_faces = np.full(len(hj), FACE_ALL, dtype=np.uint8)
+    v_faces = np.full(len(vi), FACE_ALL, dtype=np.uint8)
+    if cull:
+        h_faces &= ~np.uint8(FACE_BOTTOM)
+        v_faces &= ~np.uint8(FACE_BOTTOM)
+
+        left = hp[hj, hx0] | (vp[hj, hx0] & vp[hj + 1, hx0])
+        right = hp[hj, hx1 + 2] | (vp[hj, hx1 + 1] & vp[hj + 1, hx1 + 1])
+        h_faces[left] &= ~np.uint8(FACE_LEFT)
+        h_faces[right] &= ~np.uint8(FACE_RIGHT)
+
+        front = vp[vy0, vi] | (hp[vy0, vi] & hp[vy0, vi + 1])
+        back = vp[vy1 + 2, vi] | (hp[vy1 + 1, vi] & hp[vy1 + 1, vi + 1])
+        v_faces[front] &= ~np.uint8(FACE_FRONT)
+        v_faces[back] &= ~np.uint8(FACE_BACK)
+
+    # Daqui em diante, índices na grade inteira
+    hj, hx0, hx1 = hj + oy, hx0 + ox, hx1 + ox
+    vi, vy0, vy1 = vi + ox, vy0 + oy, vy1 + oy
+    h_y = hj * cs - half
+    v_x = vi * cs - half
+    min_x = np.concatenate((hx0 * cs - half, v_x - half_t))
+    max_x = np.concatenate((hx1 * cs + half, v_x + half_t))
+    min_y = np.concatenate((h_y - half_t, vy0 * cs - half))
+    max_y = np.concatenate((h_y + half_t, vy1 * cs + half))
+    faces = np.concatenate((h_faces, v_faces))
+
+    # Linhas divisórias da borda superior/direita pertencem ao último chunk
+    chunks = np.zeros((len(faces), 2), dtype=np.int64)
+    if chunk_size:
+        chunks[:, 0] = np.concatenate((hx0, np.minimum(vi, cols - 1))) // chunk_size
+        chunks[:, 1] = np.concatenate((np.minimum(hj, rows - 1), vy0)) // chunk_size
+    return min_x, min_y, max_x, max_y, faces, chunks
+
+
+def box_mesh_arrays(min_x, min_y, max_x, max_y, faces, wall_height):
+    """Malha (MeshArrays) de um conjunto de caixas, só com as faces visíveis"""
+    n = len(faces)
+
+    lo = np.stack((min_x, min_y, np.zeros(n)), axis=1).astype(np.float32)
+    hi = np.stack((max_x, max_y, np.full(n, wall_height)), axis=1).astype(np.float32)
+
+    # (n, 8, 3) cantos -> (n, 6, 4, 3) quads, filtrados pela máscara de faces
+    corners = np.where(_CORNERS, hi[:, None, :], lo[:, None, :])
+    quads = corners[:, _FACE_QUADS]
+    visible = (faces[:, None] & _FACE_BITS) != 0
+
+    positions = np.ascontiguousarray(quads[visible].reshape(-1, 3))
+    face_index = np.broadcast_to(np.arange(6), visible.shape)[visible]
+    normals = np.ascontiguousarray(np.repeat(_FACE_NORMALS[face_index], 4, axis=0))
+
+    quad_base = np.arange(len(face_index), dtype=np.uint32)[:, None, None] * 4
+    indices = np.ascontiguousarray((quad_base + _QUAD_TRIS).reshape(-1, 3))
+    return MeshArrays(positions, normals, indices)
+
+
+def build_mesh_arrays(grid, cell_size, wall_thickness, wall_height, merge=True, cull=True):
+    """Gera a malha inteira do labirinto em poucas operações vetorizadas"""
+    min_x, min_y, max_x, max_y, faces, _chunks = wall_box_arrays(
+        wall_array(grid), cell_size, wall_thickness, merge, cull)
+    return box_mesh_arrays(min_x, min_y, max_x, max_y, faces, wall_height)
+
+
+def chunk_count(grid, chunk_size):
+    """Quantidade de chunks (cx, cy) que cobrem a grade"""
+    return -(-grid.cols // chunk_size), -(-grid.rows // chunk_size)
+
+
+def iter_chunk_mesh_arrays(grid, cell_size, wall_thickness, wall_height, chunk_size,
+                           merge=True, cull=True, only=None):
+    """Gera (chave, MeshArrays) chunk a chunk, para montagem fatiada entre frames
+
+    As coordenadas continuam no espaço local do labirinto inteiro. O
+    culling usa a grade completa, então faces encostadas em paredes de
+    chunks vizinhos também são removidas. only limita a um conjunto de chunks;
+    se forem poucos, cada um sai da própria janela (window_chunk_mesh_arrays).
+    """
+    if only is not None and len(only) * (chunk_size + 2) ** 2 < len(grid.walls):
+        for key in only:
+            arrays = window_chunk_mesh_arrays(
+                grid, cell_size, wall_thickness, wall_height, chunk_size, key, merge, cull)
+            if arrays is not None:
+                yield key, arrays
+        return
+
+    min_x, min_y, max_x, max_y, faces, chunks = wall_box_arrays(
+        wall_array(grid), cell_size, wall_thickness, merge, cull, chunk_size)
+    n_cx, _n_cy = chunk_count(grid, chunk_size)
+    chunk_id = chunks[:, 1] * n_cx + chunks[:, 0]
+    order = np.argsort(chunk_id, kind='stable')
+    ids, starts = np.unique(chunk_id[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+
+    for chunk, start, end in zip(ids.tolist(), starts.tolist(), ends.tolist()):
+        key = (chunk % n_cx, chunk // n_cx)
+        if only is not None and key not in only:
+            continue
+        sel = order[start:end]
+        yield key, box_mesh_arrays(min_x[sel], min_y[sel], max_x[sel], max_y[sel], faces[sel], wall_height)
+
+
+def window_chunk_mesh_arrays(grid, cell_size, wall_thickness, wall_height, chunk_size, key,
+                             merge=True, cull=True):
+    """Malha (MeshArrays) de um chunk a partir só das células dele mais 1 de borda
+
+    Igual ao chunk correspondente de iter_chunk_mesh_arrays; None se o chunk
+    não tem paredes. Serve para reconstruir um chunk editado sem varrer a grade.
+    """
+    cx, cy = key
+    x0 = max(cx * chunk_size - 1, 0)
+    y0 = max(cy * chunk_size - 1, 0)
+    x1 = min((cx + 1) * chunk_size + 1, grid.cols)
+    y1 = min((cy + 1) * chunk_size + 1, grid.rows)
+    min_x, min_y, max_x, max_y, faces, chunks = wall_box_arrays(
+        wall_array(grid)[y0:y1, x0:x1], cell_size, wall_thickness, merge, cull, chunk_size,
+        origin=(x0, y0), size=(grid.rows, grid.cols))
+
+    sel = np.nonzero((chunks[:, 0] == cx) & (chunks[:, 1] == cy))[0]
+    if not len(sel):
+        return None
+    return box_mesh_arrays(min_x[sel], min_y[sel], max_x[sel], max_y[sel], faces[sel], wall_height)
+
+
+def build_chunk_mesh_arrays(grid, cell_size, wall_thickness, wall_height, chunk_size,
+                            merge=True, cull=True, only=None):
+    """Malhas por chunk de chunk_size x chunk_size células: {(cx, cy): MeshArrays}"""
+    return dict(iter_chunk_mesh_arrays(
+        grid, cell_size, wall_thickness, wall_height, chunk_size, merge, cull, only))
@@ -0,0 +1,154 @@
+"""
+Pacote de níveis (level pack)
+Um arquivo com milhares de níveis prontos: cabeçalho, índice de offsets e
+snapshots (paredes em 4 bits por célula + entrada/saída). Aberto com mmap,
+então abrir não depende do tamanho do pacote e várias instâncias do jogo
+na mesma máquina compartilham o cache de páginas do sistema.
+
+Layout:
+    cabeçalho  magic, versão, primeiro nível, níveis, variantes por nível
+    índice     (níveis * variantes + 1) offsets uint64; a entrada i vai de
+               offset[i] até offset[i + 1] (vazia = nível ausente)
+    entradas   MazeSnapshot.to_bytes()
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+
+from .snapshot import MazeSnapshot
+
+PACK_VERSION = 1
+PACK_MAGIC = b'MZP1'
+
+_HEADER = struct.Struct('<4sIIII')
+_OFFSET = struct.Struct('<Q')
+
+
+class LevelPackWriter:
+    """
+    Grava um pacote em sequência, sem guardar os níveis em memória
+
+    O espaço do índice é reservado no começo e preenchido em close().
+    A gravação é atômica: o arquivo só aparece em path ao terminar.
+    """
+
+    def __init__(self, path, first_level, count, variants=1):
+        self.path = path
+        self.first_level = int(first_level)
+        self.count = int(count)
+        self.variants = max(1, int(variants))
+        slots = self.count * self.variants
+        self.offsets = [0] * (slots + 1)
+        self.next_slot = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        self.file = os.fdopen(fd, 'wb')
+        self.file.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, self.first_level, self.count, self.variants))
+        self.file.write(b'\0' * (_OFFSET.size * (slots + 1)))
+        self.offsets[0] = self.file.tell()
+
+    def slot(self, level, variant=0):
+        return (level - self.first_level) * self.variants + variant
+
+    def add(self, level, variant, snapshot):
+        """Grava o próximo nível; níveis pulados ficam vazios no índice"""
+        slot = self.slot(level, variant)
+        if not self.next_slot <= slot < len(self.offsets) - 1:
+            raise ValueError(f"Nível {level} v{variant} fora de ordem ou do intervalo do pacote")
+        end = self.offsets[self.next_slot]
+        for skipped in range(self.next_slot, slot):
+            self.offsets[skipped + 1] = end
+
+        self.file.write(snapshot.to_bytes())
+        self.offsets[slot + 1] = self.file.tell()
+        self.next_slot = slot + 1
+
+    def close(self):
+        end = self.offsets[self.next_slot]
+        for slot in range(self.next_slot, len(self.offsets) - 1):
+            self.offsets[slot + 1] = end
+        try:
+            self.file.seek(_HEADER.size)
+            self.file.write(struct.pack(f'<{len(self.offsets)}Q', *self.offsets))
+            self.file.close()
+            # mkstemp cria com 0600; o pacote é lido por qualquer instância do jogo
+            os.chmod(self.tmp_path, 0o644)
+            os.replace(self.tmp_path, self.path)
+        except OSError:
+            self.abort()
+            raise
+
+    def abort(self):
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class LevelPack:
+    """Pacote aberto com mmap; snapshot(level, variant) custa O(1)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, first, count, variants = _HEADER.unpack_from(self._mmap, 0)
+            if magic != PACK_MAGIC or version != PACK_VERSION:
+                raise ValueError("Pacote de níveis em formato desconhecido")
+        except (struct.error, ValueError):
+            self._mmap.close()
+            raise
+        self.first_level = first
+        self.count = count
+        self.variants = variants
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, level, variant):
+        if not (0 <= level - self.first_level < self.count and 0 <= variant < self.variants):
+            return None
+        slot = (level - self.first_level) * self.variants + variant
+        start, = _OFFSET.unpack_from(self._mmap, _HEADER.size + slot * _OFFSET.size)
+        end, = _OFFSET.unpack_from(self._mmap, _HEADER.size + (slot + 1) * _OFFSET.size)
+        return (start, end) if end > start else None
+
+    def has_level(self, level, variant=0):
+        return self._entry(level, variant) is not None
+
+    def snapshot(self, level, variant=0):
+        """MazeSnapshot do nível, ou None se o pacote não o tiver"""
+        entry = self._entry(level, variant)
+        if entry is None:
+            return None
+        start, end = entry
+        return MazeSnapshot.from_bytes(self._mmap[start:end])
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def open_level_pack(path):
+    """LevelPack ou None se o arquivo não existir / for inválido"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return LevelPack(path)
+    except (OSError, ValueError) as e:
+        print(f"[LevelPack] Não foi possível abrir '{path}': {e}")
+        return None
@@ -0,0 +1,164 @@
+"""
+Geração paralela em blocos (tiles) para labirintos gigantes
+Cada tile é um labirinto perfeito gerado em um processo do pool direto no
+buffer de paredes compartilhado (multiprocessing.shared_memory); depois uma
+árvore geradora sobre os tiles abre uma porta por aresta, e o resultado
+continua sendo um labirinto perfeito
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .grid import MazeGrid, WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+from .generators import GENERATOR_STEPS, open_entrance_and_exit
+from .endless import chunk_seed
+from .rng import MazeRandom
+
+
+def tile_bounds(rows, cols, tile_size):
+    """[(tx, ty, x0, y0, largura, altura)] dos tiles que cobrem a grade"""
+    tiles = []
+    for ty, y0 in enumerate(range(0, rows, tile_size)):
+        for tx, x0 in enumerate(range(0, cols, tile_size)):
+            tiles.append((tx, ty, x0, y0, min(tile_size, cols - x0), min(tile_size, rows - y0)))
+    return tiles
+
+
+def tile_offsets(tiles):
+    """Início de cada tile no buffer dos tiles, um após o outro (cada tile é contíguo)"""
+    offsets = []
+    offset = 0
+    for _tx, _ty, _x0, _y0, width, height in tiles:
+        offsets.append(offset)
+        offset += width * height
+    return offsets
+
+
+def generate_tile(walls, tile, seed, generator='backtracker'):
+    """Gera um tile direto em walls (buffer gravável de largura x altura bytes, sem cópia)"""
+    tx, ty, _x0, _y0, width, height = tile
+    grid = MazeGrid(height, width, walls)
+    grid.reset()
+    rng = MazeRandom(chunk_seed(seed, tx, ty))
+    for _progress in GENERATOR_STEPS[generator](grid, rng, open_ends=False):
+        pass
+
+
+def untile(walls, buffer, cols, tiles, offsets):
+    """Copia (uma vez) os tiles contíguos de buffer para as linhas da grade inteira"""
+    for (_tx, _ty, x0, y0, width, height), offset in zip(tiles, offsets):
+        for y in range(height):
+            row = (y0 + y) * cols + x0
+            start = offset + y * width
+            walls[row:row + width] = buffer[start:start + width]
+
+
+def _tile_worker(shm_name, tiles, offsets, seed, generator):
+    """Roda em um processo do pool: gera os tiles direto no buffer compartilhado"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        for tile, offset in zip(tiles, offsets):
+            view = shm.buf[offset:offset + tile[4] * tile[5]]
+            try:
+                generate_tile(view, tile, seed, generator)
+            finally:
+                view.release()
+    finally:
+        shm.close()
+    return len(tiles)
+
+
+def stitch_tiles(walls, rows, cols, tile_size, rng):
+    """Liga os tiles com uma árvore geradora aleatória (Kruskal sobre os tiles)
+
+    Cada aresta da árvore vira uma porta em posição sorteada na borda
+    compartilhada; como cada tile já é uma árvore, o todo também é.
+    """
+    n_tx = -(-cols // tile_size)
+    n_ty = -(-rows // tile_size)
+    edges = [(tx, ty, 0) for ty in range(n_ty) for tx in range(n_tx - 1)]
+    edges.extend((tx, ty, 1) for ty in range(n_ty - 1) for tx in range(n_tx))
+    rng.shuffle(edges)
+
+    parent = list(range(n_tx * n_ty))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    doors = 0
+    for tx, ty, vertical in edges:
+        a = find(ty * n_tx + tx)
+        b = find((ty + vertical) * n_tx + tx + (1 - vertical))
+        if a == b:
+            continue
+        parent[b] = a
+        if vertical:
+            # Porta entre a última linha deste tile e a primeira do de cima
+            x0 = tx * tile_size
+            x = x0 + rng.randrange(min(tile_size, cols - x0))
+            y = (ty + 1) * tile_size - 1
+            walls[y * cols + x] &= ~WALL_TOP
+            walls[(y + 1) * cols + x] &= ~WALL_BOTTOM
+        else:
+            y0 = ty * tile_size
+            y = y0 + rng.randrange(min(tile_size, rows - y0))
+            x = (tx + 1) * tile_size - 1
+            walls[y * cols + x] &= ~WALL_RIGHT
+            walls[y * cols + x + 1] &= ~WALL_LEFT
+        doors += 1
+    return doors
+
+
+def generate_tiled(rows, cols, seed, tile_size=256, generator='backtracker',
+                   processes=None, open_ends=True):
+    """
+    Gera um labirinto rows x cols em tiles de tile_size, em paralelo
+
+    Args:
+        seed: Semente inteira; o resultado não depende de processes
+        generator: Nome em GENERATOR_STEPS usado dentro de cada tile
+        processes: Processos do pool (None = os.cpu_count(); 0 ou 1 = sem pool)
+        open_ends: Abre entrada e saída como os outros geradores
+
+    Returns:
+        MazeGrid com a grade inteira
+    """
+    tile_size = max(1, int(tile_size))
+    tiles = tile_bounds(rows, cols, tile_size)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(max(1, int(processes)), len(tiles))
+
+    # Tiles contíguos no buffer: cada processo grava o seu direto, sem grade própria
+    offsets = tile_offsets(tiles)
+    grid = MazeGrid(rows, cols)
+    if processes <= 1:
+        buffer = bytearray(rows * cols)
+        with memoryview(buffer) as view:
+            for tile, offset in zip(tiles, offsets):
+                generate_tile(view[offset:offset + tile[4] * tile[5]], tile, seed, generator)
+        untile(grid.walls, buffer, cols, tiles, offsets)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=rows * cols)
+        try:
+            # Vários tiles por tarefa, intercalados para equilibrar as bordas menores
+            step = processes * 4
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [pool.submit(_tile_worker, shm.name, tiles[i::step], offsets[i::step], seed, generator)
+                           for i in range(min(step, len(tiles)))]
+                for future in futures:
+                    future.result()
+            untile(grid.walls, shm.buf, cols, tiles, offsets)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    rng = MazeRandom(seed)
+    stitch_tiles(grid.walls, rows, cols, tile_size, rng)
+    if open_ends:
+        open_entrance_and_exit(grid, rng)
+    return grid
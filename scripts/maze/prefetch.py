@@ -0,0 +1,209 @@
+"""
+Pré-carregamento do próximo nível em segundo plano
+Gera paredes, entrada/saída e buffers da malha fora do thread de renderização
+"""
+
+import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .grid import MazeGrid, level_size
+from .generators import GENERATOR_STEPS
+from .snapshot import MazeSnapshot
+from .cache import MazeCache, cache_key
+from .rng import MazeRandom
+from .layout import place_ends
+
+try:
+    from . import mesh_arrays
+except ImportError:
+    mesh_arrays = None
+
+try:
+    from . import difficulty as difficulty_search
+except ImportError:
+    difficulty_search = None
+
+
+class LevelData:
+    """Resultado de um nível pronto: só dados, pode atravessar processos"""
+
+    __slots__ = ('level', 'rows', 'cols', 'walls', 'start', 'exit', 'meshes', 'from_cache', 'uploads')
+
+    def __init__(self, level, rows, cols, walls, start, exit, meshes, from_cache=False):
+        self.level = level
+        self.rows = rows
+        self.cols = cols
+        self.walls = walls
+        self.start = start
+        self.exit = exit
+        self.meshes = meshes
+        self.from_cache = from_cache
+        # meshes já convertidas em MeshUpload pelo worker (None = converter ao enviar)
+        self.uploads = None
+
+
+def open_cache(cache_dir, cache_max_bytes):
+    return MazeCache(cache_dir, cache_max_bytes) if cache_dir else None
+
+
+def level_cache_key(level, seed, cell_size, wall_thickness, wall_height,
+                    merge=True, cull=True, chunk_size=0, generator='backtracker', layout='diameter', difficulty=''):
+    rows, cols = level_size(level)
+    return cache_key(seed, rows, cols, cell_size, wall_thickness, wall_height,
+                     merge, cull, chunk_size, generator, layout, difficulty)
+
+
+def load_cached_level(cache, level, seed, cell_size, wall_thickness, wall_height,
+                      merge=True, cull=True, chunk_size=0, generator='backtracker', layout='diameter',
+                      difficulty=''):
+    """LevelData a partir do cache em disco, ou None se não houver entrada utilizável"""
+    if cache is None:
+        return None
+    key = level_cache_key(level, seed, cell_size, wall_thickness, wall_height,
+                          merge, cull, chunk_size, generator, layout, difficulty)
+    cached = cache.load(key)
+    if cached is None or (cached.meshes is None and mesh_arrays is not None):
+        return None
+    snap = cached.snapshot
+    return LevelData(level, snap.rows, snap.cols, snap.walls(), snap.start, snap.exit,
+                     cached.meshes, from_cache=True)
+
+
+def generate_level(level, seed, generator='backtracker', layout='diameter', difficulty=''):
+    """
+    Grade do nível gerada como no jogo: level_size + gerador com MazeRandom(seed) + entrada/saída
+
+    difficulty: faixas de maze.difficulty.parse_target; ignorado sem NumPy
+    """
+    rows, cols = level_size(level)
+    grid = MazeGrid(rows, cols)
+    if difficulty and difficulty_search:
+        target = difficulty_search.parse_target(difficulty)
+        difficulty_search.DifficultySearch(grid, seed, target, generator, layout).compute()
+        return grid
+    rng = MazeRandom(seed)
+    for _progress in GENERATOR_STEPS[generator](grid, rng, open_ends=False):
+        pass
+    place_ends(grid, layout, rng)
+    return grid
+
+
+def build_level_data(level, seed, cell_size, wall_thickness, wall_height,
+                     merge=True, cull=True, chunk_size=0, cache_dir=None, cache_max_bytes=0,
+                     generator='backtracker', layout='diameter', difficulty=''):
+    """
+    Gera um nível completo sem tocar na engine (ou lê do cache em disco)
+
+    meshes é um MeshArrays (malha única), um dict {(cx, cy): MeshArrays}
+    quando chunk_size > 0, ou None se o NumPy não estiver disponível.
+    """
+    params = (cell_size, wall_thickness, wall_height, merge, cull, chunk_size, generator, layout, difficulty)
+    cache = open_cache(cache_dir, cache_max_bytes)
+    data = load_cached_level(cache, level, seed, *params)
+    if data is not None:
+        return data
+
+    grid = generate_level(level, seed, generator, layout, difficulty)
+    rows, cols = grid.rows, grid.cols
+
+    meshes = None
+    if mesh_arrays:
+        if chunk_size:
+            meshes = mesh_arrays.build_chunk_mesh_arrays(
+                grid, cell_size, wall_thickness, wall_height, chunk_size, merge, cull)
+        else:
+            meshes = mesh_arrays.build_mesh_arrays(
+                grid, cell_size, wall_thickness, wall_height, merge, cull)
+
+    if cache is not None:
+        key = level_cache_key(level, seed, *params)
+        cache.store(key, MazeSnapshot.capture(grid), meshes)
+
+    return LevelData(level, rows, cols, bytes(grid.walls), grid.start, grid.exit, meshes)
+
+
+def with_uploads(data):
+    """Preenche data.uploads (a conversão cara para o formato da engine) fora do thread principal"""
+    if mesh_arrays and data.uploads is None:
+        data.uploads = mesh_arrays.prepare_uploads(data.meshes)
+    return data
+
+
+def prefetch_level(level, *params):
+    """build_level_data + with_uploads, para o worker do pré-carregamento"""
+    return with_uploads(build_level_data(level, *params))
+
+
+class LevelPrefetcher:
+    """
+    Mantém um nível futuro sendo gerado em um worker
+
+    Threads são o padrão: dentro da engine o sys.executable nem sempre é um
+    Python capaz de iniciar processos filhos. Com use_processes=True a
+    geração roda em outro processo e não disputa o GIL com o jogo; o thread
+    do worker espera o resultado e converte as malhas (with_uploads), para o
+    thread principal não desserializar milhares de dicts.
+    """
+
+    def __init__(self, use_processes=False):
+        self.use_processes = use_processes
+        self.executor = None
+        self.processes = None
+        self.future = None
+        self.key = None
+
+    def _get_executor(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="MazePrefetch")
+        return self.executor
+
+    def _in_process(self, level, *params):
+        if self.processes is None:
+            self.processes = ProcessPoolExecutor(max_workers=1)
+        return with_uploads(self.processes.submit(build_level_data, level, *params).result())
+
+    def request(self, level, *params):
+        """Agenda a geração do nível (params = argumentos extras de build_level_data)"""
+        key = (level,) + params
+        if self.key == key and self.future is not None:
+            return
+        self.cancel()
+        self.key = key
+        work = self._in_process if self.use_processes else prefetch_level
+        self.future = self._get_executor().submit(work, level, *params)
+
+    def take(self, level, *params):
+        """Retorna o LevelData pronto para esse nível/parâmetros, ou None (falha do worker é registrada)"""
+        future = self.future
+        if future is None or self.key != (level,) + params or not future.done():
+            return None
+        self.future = None
+        self.key = None
+        if future.cancelled():
+            return None
+        error = future.exception()
+        if error is not None:
+            print(f"[MazePrefetch] Falha ao pré-carregar o nível {level}; gerando no thread principal:")
+            traceback.print_exception(type(error), error, error.__traceback__)
+            return None
+        return future.result()
+
+    def run(self, fn, *args):
+        """Executa uma tarefa avulsa (ex.: gravar no cache) no mesmo worker"""
+        return self._get_executor().submit(fn, *args)
+
+    def cancel(self):
+        """Descarta o pedido atual; se já estiver rodando, o resultado é ignorado"""
+        if self.future is not None:
+            self.future.cancel()
+        self.future = None
+        self.key = None
+
+    def shutdown(self):
+        self.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        if self.processes is not None:
+            self.processes.shutdown(wait=False, cancel_futures=True)
+            self.processes = None
@@ -0,0 +1,211 @@
+"""
+Gerador pseudoaleatório portátil (PCG32)
+Mesma semente = mesma sequência em qualquer máquina, versão do Python ou
+processo. API escalar compatível com o que os geradores usam de
+random.Random e API em lote (NumPy) que continua o mesmo fluxo.
+"""
+
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_MULT = 6364136223846793005
+_MASK64 = (1 << 64) - 1
+_MASK32 = (1 << 32) - 1
+# Tamanho dos blocos da geração em lote (tabela de saltos pré-calculada)
+_BLOCK = 4096
+_jump_tables = {}
+
+
+def _jump_table(inc):
+    """(A, C) com state_i = A[i] * state + C[i]: os _BLOCK próximos estados de uma vez"""
+    table = _jump_tables.get(inc)
+    if table is None:
+        a = []
+        c = []
+        mult, add = 1, 0
+        for _i in range(_BLOCK):
+            mult = (mult * _MULT) & _MASK64
+            add = (add * _MULT + inc) & _MASK64
+            a.append(mult)
+            c.append(add)
+        table = (np.array(a, dtype=np.uint64), np.array(c, dtype=np.uint64))
+        _jump_tables[inc] = table
+    return table
+
+
+class MazeRandom:
+    """
+    Fluxo PCG32 (XSH RR, estado de 64 bits) de um labirinto
+
+    stream escolhe uma sequência independente para a mesma semente
+    (ex.: um fluxo por chunk ou por worker sem correlação entre eles).
+    Com NumPy as chamadas escalares consomem saídas geradas em lote,
+    o que não muda a sequência, só o custo por chamada.
+    """
+
+    __slots__ = ('state', 'inc', 'seed_value', '_pending', '_pos')
+
+    def __init__(self, seed=None, stream=0):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        self.seed(seed, stream)
+
+    def seed(self, seed, stream=0):
+        self.seed_value = int(seed) & _MASK64
+        self.inc = ((int(stream) << 1) | 1) & _MASK64
+        self._pending = []
+        self._pos = 0
+        self.state = 0
+        self._step()
+        self.state = (self.state + self.seed_value) & _MASK64
+        self._step()
+
+    def getstate(self):
+        return self.state, self.inc, tuple(self._pending[self._pos:])
+
+    def setstate(self, state):
+        self.state, self.inc, pending = state
+        self._pending = list(pending)
+        self._pos = 0
+
+    def _step(self):
+        """Uma saída calculada em Python puro (avança o estado)"""
+        old = self.state
+        self.state = (old * _MULT + self.inc) & _MASK64
+        shifted = (((old >> 18) ^ old) >> 27) & _MASK32
+        rot = old >> 59
+        return ((shifted >> rot) | (shifted << ((-rot) & 31))) & _MASK32
+
+    def _next32(self):
+        pos = self._pos
+        if pos < len(self._pending):
+            self._pos = pos + 1
+            return self._pending[pos]
+        if np is None:
+            return self._step()
+        self._pending = self._generate(_BLOCK).tolist()
+        self._pos = 1
+        return self._pending[0]
+
+    # API escalar (subconjunto de random.Random)
+
+    def getrandbits(self, k):
+        value = 0
+        bits = 0
+        while bits < k:
+            value |= self._next32() << bits
+            bits += 32
+        return value & ((1 << k) - 1)
+
+    def random(self, size=None, dtype=None):
+        """float em [0, 1) com 53 bits; com size devolve um array NumPy (como numpy.random.Generator)"""
+        if size is not None:
+            return self.random_array(size, dtype)
+        a = self._next32() >> 5
+        b = self._next32() >> 6
+        return (a * 67108864.0 + b) / 9007199254740992.0
+
+    def _below(self, n):
+        """Inteiro uniforme em [0, n), sem viés (rejeição)"""
+        if n <= 0:
+            raise ValueError("intervalo vazio")
+        if n <= 1 << 32:
+            threshold = ((1 << 32) - n) % n
+            pending = self._pending
+            while True:
+                # _next32 inline: é o caminho quente dos geradores
+                pos = self._pos
+                if pos < len(pending):
+                    self._pos = pos + 1
+                    r = pending[pos]
+                else:
+                    r = self._next32()
+                    pending = self._pending
+                if r >= threshold:
+                    return r % n
+        bits = n.bit_length()
+        while True:
+            r = self.getrandbits(bits)
+            if r < n:
+                return r
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            return self._below(start)
+        return start + self._below(stop - start)
+
+    def randint(self, a, b):
+        return a + self._below(b - a + 1)
+
+    def choice(self, seq):
+        if not seq:
+            raise IndexError("sequência vazia")
+        return seq[self._below(len(seq))]
+
+    def shuffle(self, seq):
+        for i in range(len(seq) - 1, 0, -1):
+            j = self._below(i + 1)
+            seq[i], seq[j] = seq[j], seq[i]
+
+    # API em lote (NumPy): consome o mesmo fluxo que as chamadas escalares
+
+    def _generate(self, count):
+        """count saídas novas direto do estado, por saltos (A, C) vetorizados"""
+        out = np.empty(count, dtype=np.uint32)
+        a, c = _jump_table(self.inc)
+        state = np.uint64(self.state)
+        done = 0
+        with np.errstate(over='ignore'):
+            while done < count:
+                n = min(_BLOCK, count - done)
+                # Estados antigos de cada saída: o atual e os n - 1 seguintes
+                old = np.empty(n, dtype=np.uint64)
+                old[0] = state
+                old[1:] = a[:n - 1] * state + c[:n - 1]
+                shifted = (((old >> np.uint64(18)) ^ old) >> np.uint64(27)).astype(np.uint32)
+                rot = (old >> np.uint64(59)).astype(np.uint32)
+                out[done:done + n] = (shifted >> rot) | (shifted << ((np.uint32(32) - rot) & np.uint32(31)))
+                state = a[n - 1] * state + c[n - 1]
+                done += n
+        self.state = int(state)
+        return out
+
+    def uint32_array(self, count):
+        """count saídas de 32 bits, as mesmas de count chamadas escalares"""
+        pending = self._pending[self._pos:self._pos + count]
+        self._pos += len(pending)
+        if len(pending) == count:
+            return np.array(pending, dtype=np.uint32)
+        rest = self._generate(count - len(pending))
+        if not pending:
+            return rest
+        return np.concatenate((np.array(pending, dtype=np.uint32), rest))
+
+    def random_array(self, count, dtype=None):
+        """count floats em [0, 1); float32 usa uma saída por valor, float64 duas"""
+        dtype = np.dtype(np.float64 if dtype is None else dtype)
+        if dtype == np.float32:
+            return (self.uint32_array(count) >> np.uint32(8)).astype(np.float32) * np.float32(1.0 / 16777216)
+        pairs = self.uint32_array(2 * count).reshape(-1, 2)
+        a = (pairs[:, 0] >> np.uint32(5)).astype(np.float64)
+        b = (pairs[:, 1] >> np.uint32(6)).astype(np.float64)
+        return (a * 67108864.0 + b) / 9007199254740992.0
+
+    def integers_array(self, count, n):
+        """count inteiros em [0, n) por multiplicação (viés < n / 2**32, desprezível aqui)"""
+        words = self.uint32_array(count).astype(np.uint64)
+        return ((words * np.uint64(n)) >> np.uint64(32)).astype(np.int64)
+
+    def bytes(self, count):
+        """count bytes aleatórios (como numpy.random.Generator.bytes)"""
+        words = self.uint32_array((count + 3) // 4)
+        return words.astype('<u4').tobytes()[:count]
+
+
+def ensure_rng(rng=None):
+    """O rng recebido, ou um MazeRandom novo com semente do sistema"""
+    return MazeRandom() if rng is None else rng
@@ -0,0 +1,83 @@
+"""
+Snapshot compacto de um labirinto
+Paredes empacotadas em 4 bits por célula (duas células por byte) + entrada/saída
+"""
+
+import struct
+
+from .grid import MazeGrid
+
+# Tabelas para desempacotar com bytes.translate (sem laço em Python)
+_LOW_NIBBLE = bytes(b & 0x0F for b in range(256))
+_HIGH_NIBBLE = bytes(b >> 4 for b in range(256))
+
+# rows, cols, start, exit (-1 = nenhuma)
+_HEADER = struct.Struct('<IIii')
+
+
+def pack_walls(walls):
+    """bytearray de máscaras (1 byte/célula) -> bytes com 2 células por byte"""
+    low = bytes(walls[0::2]).translate(_LOW_NIBBLE)
+    high = bytes(walls[1::2]).translate(_LOW_NIBBLE)
+    if len(high) < len(low):
+        high += b'\x00'
+    # Cada byte vale low | high << 4; como high < 16 o deslocamento do inteiro
+    # inteiro não vaza para o byte vizinho, e o laço fica fora do Python
+    value = int.from_bytes(low, 'little') | (int.from_bytes(high, 'little') << 4)
+    return value.to_bytes(len(low), 'little')
+
+
+def unpack_walls(packed, count):
+    """Inverso de pack_walls: devolve um bytearray com count máscaras"""
+    walls = bytearray(count)
+    walls[0::2] = packed.translate(_LOW_NIBBLE)[:(count + 1) // 2]
+    walls[1::2] = packed.translate(_HIGH_NIBBLE)[:count // 2]
+    return walls
+
+
+class MazeSnapshot:
+    """Estado imutável de um labirinto pronto, barato de guardar e restaurar"""
+
+    __slots__ = ('rows', 'cols', 'packed', 'start', 'exit')
+
+    def __init__(self, rows, cols, packed, start, exit):
+        self.rows = rows
+        self.cols = cols
+        self.packed = packed
+        self.start = start
+        self.exit = exit
+
+    @classmethod
+    def capture(cls, grid):
+        return cls(grid.rows, grid.cols, pack_walls(grid.walls), grid.start, grid.exit)
+
+    def walls(self):
+        return unpack_walls(self.packed, self.rows * self.cols)
+
+    def restore(self, grid):
+        """Copia o snapshot para uma grade do mesmo tamanho"""
+        if (grid.rows, grid.cols) != (self.rows, self.cols):
+            raise ValueError("Snapshot de tamanho diferente da grade")
+        grid.assign(self.walls(), self.start, self.exit)
+        return grid
+
+    def to_grid(self):
+        return self.restore(MazeGrid(self.rows, self.cols))
+
+    def to_bytes(self):
+        start = -1 if self.start is None else self.start
+        exit = -1 if self.exit is None else self.exit
+        return _HEADER.pack(self.rows, self.cols, start, exit) + self.packed
+
+    @classmethod
+    def from_bytes(cls, data):
+        rows, cols, start, exit = _HEADER.unpack_from(data)
+        size = (rows * cols + 1) // 2
+        packed = bytes(data[_HEADER.size:_HEADER.size + size])
+        return cls(rows, cols, packed, None if start < 0 else start, None if exit < 0 else exit)
+
+    def __eq__(self, other):
+        if not isinstance(other, MazeSnapshot):
+            return NotImplemented
+        return (self.rows, self.cols, self.packed, self.start, self.exit) == \
+            (other.rows, other.cols, other.packed, other.start, other.exit)
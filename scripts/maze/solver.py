@@ -0,0 +1,118 @@
+"""
+Solver do labirinto
+Um BFS a partir da saída sobre a máscara de paredes, guardado como campo de
+distâncias: depois disso distância, próximo passo e "está no caminho" são O(1)
+"""
+
+from array import array
+
+# Direção "nenhuma" em toward (alvo ou célula inalcançável)
+NO_STEP = 255
+
+
+class DistanceField:
+    """
+    Distância (em passos) de cada célula até target, calculada uma vez por labirinto
+
+    dist[i] é -1 para células inalcançáveis. toward[i] é o índice em
+    grid.neighbor_offsets do vizinho um passo mais perto do alvo.
+    path_mask marca o caminho mais curto da entrada (grid.start) até o alvo.
+    """
+
+    def __init__(self, grid, target=None):
+        self.grid = grid
+        self.target = grid.exit if target is None else target
+        count = len(grid.walls)
+        self.dist = array('i', [-1]) * count
+        self.toward = bytearray([NO_STEP]) * count
+        self.path_mask = bytearray(count)
+        self.ready = False
+
+    def compute_steps(self, report_every=4096):
+        """BFS retomável; devolve a fração de células já alcançadas"""
+        grid = self.grid
+        if self.target is None:
+            self.ready = True
+            yield 1.0
+            return
+
+        walls = grid.walls
+        cols, rows = grid.cols, grid.rows
+        offsets = grid.neighbor_offsets
+        # Direção de volta: o vizinho alcançado a partir de current anda "opposite" para voltar
+        back = grid.back_directions
+        dist = self.dist
+        toward = self.toward
+        total = len(walls)
+
+        dist[self.target] = 0
+        queue = [self.target]
+        head = 0
+        while head < len(queue):
+            current = queue[head]
+            head += 1
+            x = current % cols
+            y = current // cols
+            d = dist[current] + 1
+            for k, (dx, dy, delta, wall, opposite) in enumerate(offsets):
+                if walls[current] & wall:
+                    continue
+                nx = x + dx
+                ny = y + dy
+                # A malha desenha a parede se qualquer um dos lados a tiver
+                if 0 <= nx < cols and 0 <= ny < rows and dist[current + delta] < 0 \
+                        and not walls[current + delta] & opposite:
+                    neighbor = current + delta
+                    dist[neighbor] = d
+                    toward[neighbor] = back[k]
+                    queue.append(neighbor)
+            if head % report_every == 0:
+                yield head / total
+
+        self._mark_path()
+        self.ready = True
+        yield 1.0
+
+    def compute(self):
+        for _progress in self.compute_steps():
+            pass
+        return self
+
+    def _mark_path(self):
+        self.path_mask[:] = bytes(len(self.path_mask))
+        for cell in self.path(self.grid.start):
+            self.path_mask[cell] = 1
+
+    def distance(self, cell):
+        """Passos até o alvo, ou -1 (inalcançável / fora da grade)"""
+        if cell is None or not 0 <= cell < len(self.dist):
+            return -1
+        return self.dist[cell]
+
+    def next_step(self, cell):
+        """Célula vizinha um passo mais perto do alvo, ou None"""
+        if cell is None or not 0 <= cell < len(self.toward):
+            return None
+        k = self.toward[cell]
+        if k == NO_STEP:
+            return None
+        return cell + self.grid.neighbor_offsets[k][2]
+
+    def path_length(self, cell=None):
+        """Comprimento do caminho mais curto (padrão: da entrada até o alvo)"""
+        return self.distance(self.grid.start if cell is None else cell)
+
+    def on_path(self, cell):
+        """True se a célula está no caminho mais curto entre a entrada e o alvo"""
+        return cell is not None and 0 <= cell < len(self.path_mask) and bool(self.path_mask[cell])
+
+    def path(self, cell=None):
+        """Células de cell (padrão: a entrada) até o alvo, inclusive; [] se inalcançável"""
+        cell = self.grid.start if cell is None else cell
+        if self.distance(cell) < 0:
+            return []
+        cells = [cell]
+        while cell != self.target:
+            cell = self.next_step(cell)
+            cells.append(cell)
+        return cells
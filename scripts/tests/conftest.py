@@ -0,0 +1,5 @@
+import os
+import sys
+
+# O pacote maze fica em scripts/, ao lado dos componentes da engine
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,48 @@
+import random
+
+from maze import MazeGrid, DistanceField
+from maze.bands import EllerBandStream
+from maze.graph import open_moves, passage_count
+
+
+def test_bands_do_not_depend_on_request_order():
+    reference = EllerBandStream(42, 24, 8, max_bands=64)
+    expected = [bytes(reference.band(i).walls) for i in range(20)]
+    order = list(range(20))
+    random.Random(3).shuffle(order)
+    # Janela pequena: quase todo pedido refaz uma faixa despejada
+    stream = EllerBandStream(42, 24, 8, max_bands=2)
+    for i in order + order:
+        assert bytes(stream.band(i).walls) == expected[i]
+    assert len(stream.bands) == 2
+
+
+def test_stacked_bands_are_acyclic_and_reach_the_top():
+    stream = EllerBandStream(7, 24, 8)
+    rows = 8 * 12
+    grid = MazeGrid(rows, 24)
+    grid.walls[:] = b''.join(bytes(stream.band(i).walls) for i in range(12))
+
+    seen = bytearray(len(grid.walls))
+    components = 0
+    for cell in range(len(grid.walls)):
+        if seen[cell]:
+            continue
+        components += 1
+        field = DistanceField(grid, cell).compute()
+        reached = [i for i, d in enumerate(field.dist) if d >= 0]
+        for i in reached:
+            seen[i] = 1
+        # Nada fica isolado: todo componente continua pela última linha
+        assert max(reached) >= (rows - 1) * 24
+    assert passage_count(open_moves(grid)) == len(grid.walls) - components
+
+
+def test_chunks_slice_bands():
+    stream = EllerBandStream(1, 20, 8)
+    band = stream.band(2)
+    chunk = stream.chunk(1, 2)
+    assert (chunk.rows, chunk.cols) == (8, 8)
+    assert bytes(chunk.walls[:8]) == bytes(band.walls[8:16])
+    assert stream.chunk(2, 0).cols == 4
+    assert stream.chunk(3, 0) is None and stream.chunk(0, -1) is None
@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+from maze import MazeGrid, MazeRandom, GENERATOR_STEPS, WALL_TOP
+from maze.layout import place_ends, exit_marker_offset
+
+CELL_SIZE = 2.0
+# SensorExit dispara com o jogador a menos de 1.0 do sensor
+TRIGGER_DISTANCE = 1.0
+
+
+def build(generator, layout, seed):
+    grid = MazeGrid(12, 15)
+    rng = MazeRandom(seed)
+    for _progress in GENERATOR_STEPS[generator](grid, rng, open_ends=False):
+        pass
+    place_ends(grid, layout, rng)
+    return grid
+
+
+def marker_cell(grid):
+    """(x, y) da célula sob o sensor de saída"""
+    ex, ey, _ez = grid.exit_position(CELL_SIZE)
+    dx, dy, _dz = exit_marker_offset(grid)
+    return math.floor((ex + dx) / CELL_SIZE + 0.5), math.floor((ey + dy) / CELL_SIZE + 0.5)
+
+
+@pytest.mark.parametrize('generator', sorted(GENERATOR_STEPS))
+@pytest.mark.parametrize('seed', range(5))
+def test_diameter_sensor_inside_exit_cell(generator, seed):
+    grid = build(generator, 'diameter', seed)
+    assert marker_cell(grid) == grid.coords(grid.exit)
+    dx, dy, _dz = exit_marker_offset(grid)
+    assert math.hypot(dx, dy) < TRIGGER_DISTANCE
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_sensor_past_open_exit_wall(seed):
+    grid = build('backtracker', 'random', seed)
+    x, y = grid.coords(grid.exit)
+    # Logo acima da saída, fora da grade, e a parede de cima da saída está aberta
+    assert marker_cell(grid) == (x, grid.rows)
+    assert not grid.walls[grid.exit] & WALL_TOP
+
+
+def test_marker_ignores_configured_layout():
+    # Um nível 'random' (ex.: vindo de um pack) com o builder configurado em 'diameter'
+    grid = build('backtracker', 'random', 0)
+    x, _y = grid.coords(grid.exit)
+    assert marker_cell(grid) == (x, grid.rows)
+    grid.walls[grid.exit] |= WALL_TOP
+    assert marker_cell(grid) == grid.coords(grid.exit)
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from maze import MazeGrid, MazeRandom, GENERATOR_STEPS
+from maze.mesh_arrays import chunk_count, iter_chunk_mesh_arrays, window_chunk_mesh_arrays
+
+
+@pytest.mark.parametrize("merge,cull", [(True, True), (True, False), (False, True)])
+@pytest.mark.parametrize("rows,cols,chunk_size", [(17, 23, 5), (16, 16, 8), (9, 30, 4)])
+def test_window_matches_full_grid(rows, cols, chunk_size, merge, cull):
+    grid = MazeGrid(rows, cols)
+    for _progress in GENERATOR_STEPS["backtracker"](grid, MazeRandom(rows * cols)):
+        pass
+    full = dict(iter_chunk_mesh_arrays(grid, 2.0, 0.2, 3.0, chunk_size, merge, cull))
+    n_cx, n_cy = chunk_count(grid, chunk_size)
+    for cx in range(n_cx):
+        for cy in range(n_cy):
+            window = window_chunk_mesh_arrays(grid, 2.0, 0.2, 3.0, chunk_size, (cx, cy), merge, cull)
+            expected = full.get((cx, cy))
+            assert (window is None) == (expected is None)
+            if window is not None:
+                assert np.array_equal(window.positions, expected.positions)
+                assert np.array_equal(window.normals, expected.normals)
+                assert np.array_equal(window.indices, expected.indices)
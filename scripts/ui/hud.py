@@ -1,6 +1,6 @@
 """
 HUD (Heads-Up Display) - Elementos de interface sempre visíveis
-Gerencia: Level, Score, Tempo, etc.
+Gerencia: Level, Score, Tempo, Progresso de carregamento, etc.
 """
 
 class HUD:
@@ -19,15 +19,27 @@ class HUD:
             xml_widgets: Dicionário de widgets carregados do XML
         """
         self.widgets['level'] = xml_widgets.get('Level')
+        self.widgets['loading'] = xml_widgets.get('LoadingBar')
         
         if not self.widgets['level']:
             print("[HUD] ERRO: Widget 'Level' não encontrado no XML")
+        
+        if self.widgets['loading']:
+            self.widgets['loading'].visible = False
     
     def update(self):
         """Atualiza informações do HUD a cada frame"""
         if self.maze_builder and self.widgets.get('level'):
             current_level = self.maze_builder.get_level()
             self.widgets['level'].text = f"Level: {current_level}"
+        
+        # Barra de progresso enquanto o labirinto é montado em fatias
+        loading = self.widgets.get('loading')
+        if self.maze_builder and loading:
+            building = self.maze_builder.is_building()
+            loading.visible = building
+            if building:
+                loading.percent = self.maze_builder.get_build_progress()
     
     def set_maze_builder(self, builder):
         """
@@ -40,8 +52,8 @@ class HUD:
     
     def show(self):
         """Mostra o HUD"""
-        for widget in self.widgets.values():
-            if widget:
+        for name, widget in self.widgets.items():
+            if widget and name != 'loading':
                 widget.visible = True
     
     def hide(self):
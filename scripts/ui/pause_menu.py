@@ -11,17 +11,20 @@ class PauseMenu:
         self.menu_frame = None
         self.resume_button = None
         self.restart_button = None
+        self.new_layout_button = None
         self.quit_button = None
         
         # Callbacks externos
         self.on_resume_callback = None
         self.on_restart_callback = None
+        self.on_new_layout_callback = None
         self.on_quit_callback = None
         
         # Controle de cliques
         self.button_click_pending = None
         self.resume_was_active = False
         self.restart_was_active = False
+        self.new_layout_was_active = False
         self.quit_was_active = False
     
     def load(self, xml_widgets):
@@ -49,6 +52,7 @@ class PauseMenu:
         # Buscar botões
         self.resume_button = self.menu_frame.children.get('ResumeButton')
         self.restart_button = self.menu_frame.children.get('RestartButton')
+        self.new_layout_button = self.menu_frame.children.get('NewLayoutButton')
         self.quit_button = self.menu_frame.children.get('QuitButton')
         
         if self.resume_button and self.quit_button:
@@ -64,6 +68,11 @@ class PauseMenu:
             if self.restart_button:
                 self.restart_button.frozen = False
                 self.restart_button.on_active = self._on_restart_active
+            
+            # New Layout também é opcional
+            if self.new_layout_button:
+                self.new_layout_button.frozen = False
+                self.new_layout_button.on_active = self._on_new_layout_active
         else:
             print("[PauseMenu] ERRO: Botões essenciais não encontrados no menu")
     
@@ -79,6 +88,12 @@ class PauseMenu:
             self.restart_was_active = True
             self.button_click_pending = 'restart'
     
+    def _on_new_layout_active(self, widget):
+        """Callback interno quando o botão New Layout é pressionado"""
+        if not self.new_layout_was_active:
+            self.new_layout_was_active = True
+            self.button_click_pending = 'new_layout'
+    
     def _on_quit_active(self, widget):
         """Callback interno quando o botão Quit é pressionado"""
         if not self.quit_was_active:
@@ -95,6 +110,8 @@ class PauseMenu:
                 self.resume_button.frozen = False
             if self.restart_button:
                 self.restart_button.frozen = False
+            if self.new_layout_button:
+                self.new_layout_button.frozen = False
             if self.quit_button:
                 self.quit_button.frozen = False
     
@@ -116,6 +133,11 @@ class PauseMenu:
                     self.on_restart_callback()
                 self.restart_was_active = False
                 
+            elif self.button_click_pending == 'new_layout':
+                if self.on_new_layout_callback:
+                    self.on_new_layout_callback()
+                self.new_layout_was_active = False
+                
             elif self.button_click_pending == 'quit':
                 if self.on_quit_callback:
                     self.on_quit_callback()
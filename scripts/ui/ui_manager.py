@@ -61,6 +61,7 @@ class UIManager:
         
         self.pause_menu.on_resume_callback = self._on_resume
         self.pause_menu.on_restart_callback = self._on_restart
+        self.pause_menu.on_new_layout_callback = self._on_new_layout
         self.pause_menu.on_quit_callback = self._on_quit
         
         # Carregar interface do XML
@@ -161,12 +162,23 @@ class UIManager:
     
     def _on_restart(self):
         """Callback quando o jogador clica em 'Restart' no menu de pausa"""
+        self._restart_level(new_layout=False)
+    
+    def _on_new_layout(self):
+        """Callback quando o jogador clica em 'New Layout' no menu de pausa"""
+        self._restart_level(new_layout=True)
+    
+    def _restart_level(self, new_layout):
+        """
+        Reinicia o nível atual sem mudar o número do nível
+        
+        Args:
+            new_layout: True gera um labirinto novo; False recomeça o mesmo layout
+        """
         self.hide_pause_menu()
         
-        # Regenerar o nível atual sem mudar o número do nível
         if self.maze_builder:
-            # Regenerar o labirinto mantendo o mesmo nível
-            self.maze_builder.regenerate_current_level()
+            self.maze_builder.restart_level(new_layout=new_layout)
         
         # Reposicionar o sensor de saída para a nova posição
         for obj in self.scene.objects:
@@ -190,7 +202,9 @@ class UIManager:
     # ========================================
     
     def is_game_paused(self):
-        """Retorna se o jogo está pausado"""
+        """Retorna se o jogo está pausado (inclui a montagem de um novo labirinto)"""
+        if self.maze_builder and self.maze_builder.is_building():
+            return True
         return self.game_paused
     
     # ========================================